@@ -1,9 +1,12 @@
 import time
-from typing import Dict, Any, List
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 from io import BytesIO
 import base64
+import hashlib
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +18,9 @@ class AIVisionMiddleware:
         self.settings = settings
         self.enabled = settings.enabled if settings else False
         self.ollama_client = None
+        # Markdown of already processed documents, keyed by content digest
+        self._result_cache: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._result_cache_lock = threading.Lock()
         
         if not settings:
             logger.warning("No AI Vision settings provided - middleware disabled")
@@ -48,6 +54,15 @@ class AIVisionMiddleware:
         else:
             logger.info("AI Vision middleware initialized but disabled by configuration")
 
+    def warmup(self):
+        """Import the page rasterizer and have Ollama load the vision model."""
+        import pdf2image  # noqa: F401
+        from PIL import Image  # noqa: F401
+
+        # A generate call without a prompt only loads the model into memory
+        self.ollama_client.generate(model=self.settings.model_name)
+        logger.info(f"AI Vision warm-up completed, model {self.settings.model_name} loaded")
+
     def is_supported_file(self, filename: str) -> bool:
         """Check if file extension is supported by AI Vision."""
         if not self.settings:
@@ -76,13 +91,15 @@ class AIVisionMiddleware:
             
             # Reset stream position
             pdf_stream.seek(0)
-            pdf_size = len(pdf_stream.getvalue())
+            # pdf2image needs bytes: copy the buffer once and reuse it for the size
+            pdf_bytes = pdf_stream.getvalue()
+            pdf_size = len(pdf_bytes)
             logger.debug(f"PDF size: {pdf_size / (1024*1024):.2f} MB")
             
             # Convert PDF to images
             logger.debug("Converting PDF pages to images...")
             images = pdf2image.convert_from_bytes(
-                pdf_stream.getvalue(),
+                pdf_bytes,
                 dpi=200,  # Good balance between quality and size
                 fmt='PIL'
             )
@@ -142,9 +159,10 @@ class AIVisionMiddleware:
             image = image.convert('RGB')
         
         image.save(buffer, format='JPEG', quality=self.settings.image_quality)
-        buffer_size = len(buffer.getvalue())
-        
-        img_str = base64.b64encode(buffer.getvalue()).decode()
+        # Read the encoded image through a view instead of getvalue() copies
+        with buffer.getbuffer() as view:
+            buffer_size = view.nbytes
+            img_str = base64.b64encode(view).decode()
         
         conversion_time = time.time() - start_time
         logger.debug(f"Image conversion completed in {conversion_time:.3f}s: "
@@ -207,6 +225,25 @@ Extract the text now:"""
             logger.error(f"Failed to process page {page_number} with vision model after {processing_time:.2f}s: {e}")
             raise
 
+    def _get_cached_result(self, key: str) -> Optional[str]:
+        with self._result_cache_lock:
+            entry = self._result_cache.get(key)
+            if entry is None:
+                return None
+            stored_at, content = entry
+            if time.time() - stored_at > self.settings.cache_ttl:
+                del self._result_cache[key]
+                return None
+            self._result_cache.move_to_end(key)
+            return content
+
+    def _store_cached_result(self, key: str, content: str):
+        with self._result_cache_lock:
+            self._result_cache[key] = (time.time(), content)
+            self._result_cache.move_to_end(key)
+            while len(self._result_cache) > self.settings.cache_size:
+                self._result_cache.popitem(last=False)
+
     def process_document(self, file_stream: BytesIO, filename: str) -> str:
         """Process entire document with AI Vision and return markdown content."""
         if not self.enabled:
@@ -217,6 +254,13 @@ Extract the text now:"""
             logger.error(f"File type not supported by AI Vision: {filename}")
             raise ValueError(f"File type not supported by AI Vision: {filename}")
         
+        # The settings are fixed per instance, so the file content alone identifies the output
+        cache_key = hashlib.blake2b(file_stream.getbuffer(), digest_size=32).hexdigest()
+        cached_content = self._get_cached_result(cache_key)
+        if cached_content is not None:
+            logger.info(f"AI Vision result for {filename} served from cache")
+            return cached_content
+
         logger.info(f"Starting AI Vision document processing for {filename}")
         document_start_time = time.time()
         
@@ -279,6 +323,10 @@ Extract the text now:"""
             logger.info(f"Final document: {len(combined_content)} characters, "
                        f"avg {total_time/total_pages:.2f}s per page")
             
+            # Pages that failed may succeed on a retry, so only complete results are kept
+            if successful_pages == total_pages:
+                self._store_cached_result(cache_key, combined_content)
+            
             return combined_content
             
         except Exception as e:
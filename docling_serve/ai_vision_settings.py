@@ -29,4 +29,8 @@ class AIVisionSettings(BaseSettings):
     # Output formatting
     preserve_formatting: bool = True
     include_page_breaks: bool = True
-    page_break_marker: str = "\n\n---\n\n"
\ No newline at end of file
+    page_break_marker: str = "\n\n---\n\n"
+    
+    # Cache of processed documents, keyed by file content
+    cache_size: int = 256
+    cache_ttl: int = 86400  # 1 day
\ No newline at end of file
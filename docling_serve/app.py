@@ -102,16 +102,12 @@ except ImportError as e:
     ocrmypdf_middleware = None
 
 try:
-    from docling_serve.settings import arabic_correction_settings  
-    from docling_serve.arabic_correction_middleware import ArabicCorrectionMiddleware
-    arabic_middleware = ArabicCorrectionMiddleware(
-        enabled=arabic_correction_settings.enabled if arabic_correction_settings else False,
-        ollama_host=arabic_correction_settings.ollama_host if arabic_correction_settings else "http://localhost:11434",
-        model_name=arabic_correction_settings.model_name if arabic_correction_settings else "command-r7b-arabic"
+    from docling_serve.arabic_correction_middleware import (
+        ArabicCorrectionMiddleware,
+        get_arabic_middleware,
     )
 except ImportError as e:
     _log.warning(f"Arabic correction middleware not available: {e}")
-    arabic_middleware = None
 
 
 # Context manager to initialize and clean up the lifespan of the FastAPI app
@@ -155,16 +151,8 @@ def create_app():  # noqa: C901
 
     # Initialize Arabic correction middleware
     try:
-        if arabic_correction_settings:
-            arabic_middleware = ArabicCorrectionMiddleware(
-                enabled=arabic_correction_settings.enabled,
-                ollama_host=arabic_correction_settings.ollama_host,
-                model_name=arabic_correction_settings.model_name
-            )
-            _log.info(f"Arabic correction middleware initialized: enabled={arabic_correction_settings.enabled}")
-        else:
-            arabic_middleware = ArabicCorrectionMiddleware(enabled=False)
-            _log.info("Arabic correction middleware disabled: settings not available")
+        arabic_middleware = get_arabic_middleware()
+        _log.info(f"Arabic correction middleware initialized: enabled={arabic_middleware.enabled}")
     except Exception as e:
         _log.warning(f"Failed to initialize Arabic correction middleware: {e}")
         arabic_middleware = ArabicCorrectionMiddleware(enabled=False)
@@ -1,15 +1,46 @@
+import gzip
 import logging
+import logging.handlers
 import os
-from datetime import datetime
-from typing import Dict, Any, Tuple
+import re
+import shutil
+from functools import lru_cache
+from typing import Dict, Any, Optional, Tuple
 from pathlib import Path
 from langdetect import detect
 from ollama import Client as OllamaClient
 
+from docling_serve.settings import arabic_correction_settings
+
 # logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
+# Arabic Unicode block, used to skip language detection on non-Arabic text
+ARABIC_CHAR_RE = re.compile(r'[\u0600-\u06FF]')
+
+
+def _gzip_rotator(source: str, dest: str) -> None:
+    """Compress the finished daily log file, which is mostly plain Arabic prose."""
+    with open(source, "rb") as f_in, gzip.open(dest, "wb") as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    os.remove(source)
+
+
+def _create_correction_log_handler(path: Path, fmt: str) -> logging.Handler:
+    """Daily rotating handler; the file is only opened on the first record."""
+    handler = logging.handlers.TimedRotatingFileHandler(
+        path, when="midnight", encoding="utf-8", delay=True
+    )
+    handler.namer = lambda name: name + ".gz"
+    handler.rotator = _gzip_rotator
+    handler.setFormatter(logging.Formatter(fmt))
+    return handler
+
+
 class ArabicCorrectionMiddleware:
+    # Text fields of a document response that are candidates for correction
+    FIELDS = ("text_content", "md_content", "html_content")
+
     def __init__(self, enabled: bool = True, ollama_host: str = "http://localhost:11434", model_name: str = "command-r7b-arabic"):
         self.enabled = enabled
         self.ollama_client = OllamaClient(host=ollama_host) if enabled else None
@@ -38,34 +69,33 @@ class ArabicCorrectionMiddleware:
         self.before_logger = logging.getLogger("arabic_correction.before")
         self.before_logger.setLevel(logging.INFO)
         self.before_logger.handlers.clear()  # Clear any existing handlers
-        
-        before_handler = logging.FileHandler(
-            log_dir / f"before_correction_{datetime.now().strftime('%Y%m%d')}.log",
-            encoding='utf-8'
-        )
-        before_formatter = logging.Formatter(
-            '%(asctime)s | LENGTH:%(message_length)d | %(message)s'
+        self.before_logger.addHandler(
+            _create_correction_log_handler(
+                log_dir / "before_correction.log",
+                '%(asctime)s | LENGTH:%(message_length)d | %(message)s',
+            )
         )
-        before_handler.setFormatter(before_formatter)
-        self.before_logger.addHandler(before_handler)
         self.before_logger.propagate = False
         
         # Setup after text logger
         self.after_logger = logging.getLogger("arabic_correction.after")
         self.after_logger.setLevel(logging.INFO)
         self.after_logger.handlers.clear()  # Clear any existing handlers
-        
-        after_handler = logging.FileHandler(
-            log_dir / f"after_correction_{datetime.now().strftime('%Y%m%d')}.log",
-            encoding='utf-8'
-        )
-        after_formatter = logging.Formatter(
-            '%(asctime)s | LENGTH:%(message_length)d | MODIFIED:%(was_modified)s | %(message)s'
+        self.after_logger.addHandler(
+            _create_correction_log_handler(
+                log_dir / "after_correction.log",
+                '%(asctime)s | LENGTH:%(message_length)d | MODIFIED:%(was_modified)s | %(message)s',
+            )
         )
-        after_handler.setFormatter(after_formatter)
-        self.after_logger.addHandler(after_handler)
         self.after_logger.propagate = False
 
+    def warmup(self):
+        """Load the langdetect profiles and have Ollama load the correction model."""
+        detect("مرحبا بالعالم")
+        # A generate call without a prompt only loads the model into memory
+        self.ollama_client.generate(model=self.model_name)
+        self.logger.info(f"Arabic correction warm-up completed, model {self.model_name} loaded")
+
     def should_correct_text(self, text: str) -> bool:
         """Determine if text should be corrected (Arabic detection)."""
         self.logger.debug(f"Checking if text should be corrected - Length: {len(text) if text else 0}")
@@ -81,6 +111,10 @@ class ArabicCorrectionMiddleware:
         if len(text.strip()) < 10:
             self.logger.debug(f"Text too short for correction: {len(text.strip())} characters")
             return False
+
+        if not ARABIC_CHAR_RE.search(text):
+            self.logger.debug("No Arabic characters found, skipping language detection")
+            return False
             
         try:
             clean_text = " ".join(text.split()[:100])
@@ -190,12 +224,16 @@ class ArabicCorrectionMiddleware:
         
         documents_processed = 0
         corrections_applied = 0
+        # Shared by every document of the batch, so repeated content is corrected once
+        corrected_cache: Dict[str, str] = {}
         
         try:
             # Handle response object with document attribute
             if hasattr(result, 'document') and result.document is not None:
                 self.logger.debug("Processing single document from result.document attribute")
-                corrected_document, doc_corrections = self._process_document_response(result.document)
+                corrected_document, doc_corrections = self._process_document_response(
+                    result.document, corrected_cache
+                )
                 
                 # Update the document in place
                 result.document = corrected_document
@@ -210,7 +248,7 @@ class ArabicCorrectionMiddleware:
                 corrected_documents = []
                 for i, doc in enumerate(result.documents):
                     self.logger.debug(f"Processing document {i+1}/{doc_count}")
-                    corrected_doc, doc_corrections = self._process_document_response(doc)
+                    corrected_doc, doc_corrections = self._process_document_response(doc, corrected_cache)
                     corrected_documents.append(corrected_doc)
                     corrections_applied += doc_corrections
                     documents_processed += 1
@@ -223,7 +261,9 @@ class ArabicCorrectionMiddleware:
                 
                 if "document" in result:
                     self.logger.debug("Processing single document from dictionary")
-                    result["document"], doc_corrections = self._process_document_dict(result["document"])
+                    result["document"], doc_corrections = self._process_document_dict(
+                        result["document"], corrected_cache
+                    )
                     documents_processed = 1
                     corrections_applied = doc_corrections
                     
@@ -234,7 +274,7 @@ class ArabicCorrectionMiddleware:
                     processed_docs = []
                     for i, doc in enumerate(result["documents"]):
                         self.logger.debug(f"Processing document {i+1}/{doc_count}")
-                        processed_doc, doc_corrections = self._process_document_dict(doc)
+                        processed_doc, doc_corrections = self._process_document_dict(doc, corrected_cache)
                         processed_docs.append(processed_doc)
                         corrections_applied += doc_corrections
                         documents_processed += 1
@@ -252,75 +292,50 @@ class ArabicCorrectionMiddleware:
         
         return result
 
-    def _process_document_response(self, document_response) -> Tuple[Any, int]:
+    def _correct_field(self, field: str, content: str, corrected_cache: Dict[str, str]) -> str:
+        """Correct a single content field, reusing corrections of identical content."""
+        self.logger.debug(f"Checking {field} for Arabic correction - Length: {len(content)}")
+
+        if content in corrected_cache:
+            self.logger.debug(f"{field} matches already processed content, reusing result")
+            return corrected_cache[content]
+
+        if self.should_correct_text(content):
+            self.logger.info(f"Applying Arabic OCR correction to {field}")
+            corrected_content = self.correct_arabic_text(content)
+
+            if content != corrected_content:
+                self.logger.info(f"{field} was successfully corrected")
+            else:
+                self.logger.debug(f"{field} was not modified after correction")
+        else:
+            self.logger.debug(f"{field} does not require Arabic correction")
+            corrected_content = content
+
+        corrected_cache[content] = corrected_content
+        return corrected_content
+
+    def _process_document_response(
+        self, document_response, corrected_cache: Optional[Dict[str, str]] = None
+    ) -> Tuple[Any, int]:
         """Process DocumentResponse object for Arabic correction."""
         self.logger.debug(f"Processing DocumentResponse object: {type(document_response)}")
         
         corrections_count = 0
+        if corrected_cache is None:
+            corrected_cache = {}
         
         try:
-            # Correct text_content if it's Arabic
-            if hasattr(document_response, 'text_content') and document_response.text_content:
-                text_content = document_response.text_content
-                self.logger.debug(f"Checking text_content for Arabic correction - Length: {len(text_content)}")
-                
-                if self.should_correct_text(text_content):
-                    self.logger.info("Applying Arabic OCR correction to text_content")
-                    original_content = text_content
-                    corrected_content = self.correct_arabic_text(text_content)
-                    
-                    # Update the attribute directly
-                    document_response.text_content = corrected_content
-                    
-                    if original_content != corrected_content:
-                        corrections_count += 1
-                        self.logger.info("text_content was successfully corrected")
-                    else:
-                        self.logger.debug("text_content was not modified after correction")
-                else:
-                    self.logger.debug("text_content does not require Arabic correction")
-            
-            # Correct md_content if it's Arabic
-            if hasattr(document_response, 'md_content') and document_response.md_content:
-                md_content = document_response.md_content
-                self.logger.debug(f"Checking md_content for Arabic correction - Length: {len(md_content)}")
-                
-                if self.should_correct_text(md_content):
-                    self.logger.info("Applying Arabic OCR correction to md_content")
-                    original_content = md_content
-                    corrected_content = self.correct_arabic_text(md_content)
-                    
-                    # Update the attribute directly
-                    document_response.md_content = corrected_content
-                    
-                    if original_content != corrected_content:
-                        corrections_count += 1
-                        self.logger.info("md_content was successfully corrected")
-                    else:
-                        self.logger.debug("md_content was not modified after correction")
-                else:
-                    self.logger.debug("md_content does not require Arabic correction")
-            
-            # Also check for html_content if available
-            if hasattr(document_response, 'html_content') and document_response.html_content:
-                html_content = document_response.html_content
-                self.logger.debug(f"Checking html_content for Arabic correction - Length: {len(html_content)}")
-                
-                if self.should_correct_text(html_content):
-                    self.logger.info("Applying Arabic OCR correction to html_content")
-                    original_content = html_content
-                    corrected_content = self.correct_arabic_text(html_content)
-                    
+            for field in self.FIELDS:
+                content = getattr(document_response, field, None)
+                if not content:
+                    continue
+
+                corrected_content = self._correct_field(field, content, corrected_cache)
+                if corrected_content != content:
                     # Update the attribute directly
-                    document_response.html_content = corrected_content
-                    
-                    if original_content != corrected_content:
-                        corrections_count += 1
-                        self.logger.info("html_content was successfully corrected")
-                    else:
-                        self.logger.debug("html_content was not modified after correction")
-                else:
-                    self.logger.debug("html_content does not require Arabic correction")
+                    setattr(document_response, field, corrected_content)
+                    corrections_count += 1
                     
         except Exception as e:
             self.logger.error(f"Error processing DocumentResponse: {e}", exc_info=True)
@@ -328,69 +343,39 @@ class ArabicCorrectionMiddleware:
         self.logger.debug(f"DocumentResponse processing completed - Corrections applied: {corrections_count}")
         return document_response, corrections_count
 
-    def _process_document_dict(self, document: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
+    def _process_document_dict(
+        self, document: Dict[str, Any], corrected_cache: Optional[Dict[str, str]] = None
+    ) -> Tuple[Dict[str, Any], int]:
         """Process individual document dictionary for Arabic correction."""
         self.logger.debug("Processing individual document dictionary for Arabic correction")
         
         corrected_doc = document.copy()
         corrections_count = 0
+        if corrected_cache is None:
+            corrected_cache = {}
         
-        # Correct text_content if it's Arabic
-        if "text_content" in document and document["text_content"]:
-            text_content = document["text_content"]
-            self.logger.debug(f"Checking text_content for Arabic correction - Length: {len(text_content)}")
-            
-            if self.should_correct_text(text_content):
-                self.logger.info("Applying Arabic OCR correction to text_content")
-                original_content = text_content
-                corrected_content = self.correct_arabic_text(text_content)
-                corrected_doc["text_content"] = corrected_content
-                
-                if original_content != corrected_content:
-                    corrections_count += 1
-                    self.logger.info("text_content was successfully corrected")
-                else:
-                    self.logger.debug("text_content was not modified after correction")
-            else:
-                self.logger.debug("text_content does not require Arabic correction")
-        
-        # Correct md_content if it's Arabic
-        if "md_content" in document and document["md_content"]:
-            md_content = document["md_content"]
-            self.logger.debug(f"Checking md_content for Arabic correction - Length: {len(md_content)}")
-            
-            if self.should_correct_text(md_content):
-                self.logger.info("Applying Arabic OCR correction to md_content")
-                original_content = md_content
-                corrected_content = self.correct_arabic_text(md_content)
-                corrected_doc["md_content"] = corrected_content
-                
-                if original_content != corrected_content:
-                    corrections_count += 1
-                    self.logger.info("md_content was successfully corrected")
-                else:
-                    self.logger.debug("md_content was not modified after correction")
-            else:
-                self.logger.debug("md_content does not require Arabic correction")
-        
-        # Correct html_content if it's Arabic
-        if "html_content" in document and document["html_content"]:
-            html_content = document["html_content"]
-            self.logger.debug(f"Checking html_content for Arabic correction - Length: {len(html_content)}")
-            
-            if self.should_correct_text(html_content):
-                self.logger.info("Applying Arabic OCR correction to html_content")
-                original_content = html_content
-                corrected_content = self.correct_arabic_text(html_content)
-                corrected_doc["html_content"] = corrected_content
-                
-                if original_content != corrected_content:
-                    corrections_count += 1
-                    self.logger.info("html_content was successfully corrected")
-                else:
-                    self.logger.debug("html_content was not modified after correction")
-            else:
-                self.logger.debug("html_content does not require Arabic correction")
+        for field in self.FIELDS:
+            content = document.get(field)
+            if not content:
+                continue
+
+            corrected_content = self._correct_field(field, content, corrected_cache)
+            corrected_doc[field] = corrected_content
+            if corrected_content != content:
+                corrections_count += 1
         
         self.logger.debug(f"Document dictionary processing completed - Corrections applied: {corrections_count}")
-        return corrected_doc, corrections_count
\ No newline at end of file
+        return corrected_doc, corrections_count
+
+
+@lru_cache
+def get_arabic_middleware() -> ArabicCorrectionMiddleware:
+    """Process-wide middleware instance, so the Ollama client and log handlers are shared."""
+    if arabic_correction_settings is None:
+        return ArabicCorrectionMiddleware(enabled=False)
+
+    return ArabicCorrectionMiddleware(
+        enabled=arabic_correction_settings.enabled,
+        ollama_host=arabic_correction_settings.ollama_host,
+        model_name=arabic_correction_settings.model_name,
+    )
@@ -1,6 +1,9 @@
 import os
+from functools import lru_cache
+
 from docling_serve.settings import ocrmypdf_settings, arabic_correction_settings
 
+@lru_cache
 def get_ocrmypdf_config():
     """Get OCRMyPDF middleware configuration (legacy function for backward compatibility)."""
     if ocrmypdf_settings:
@@ -19,6 +22,7 @@ def get_ocrmypdf_config():
             "timeout": int(os.getenv("DOCLING_OCRMYPDF_TIMEOUT", "300")),
         }
 
+@lru_cache
 def get_arabic_correction_config():
     """Get Arabic correction configuration for display."""
     if arabic_correction_settings:
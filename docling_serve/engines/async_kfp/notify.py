@@ -1,4 +1,5 @@
 import ssl
+from functools import lru_cache
 
 import certifi
 import httpx
@@ -7,6 +8,18 @@ from docling_serve.datamodel.callback import ProgressCallbackRequest
 from docling_serve.datamodel.kfp import CallbackSpec
 
 
+@lru_cache
+def _get_callback_client(ca_cert: str) -> httpx.Client:
+    # One client per CA bundle: the SSL context is built once and
+    # connections are reused across progress notifications.
+    # https://www.python-httpx.org/advanced/ssl/#configuring-client-instances
+    if ca_cert:
+        ctx = ssl.create_default_context(cadata=ca_cert)
+    else:
+        ctx = ssl.create_default_context(cafile=certifi.where())
+    return httpx.Client(verify=ctx)
+
+
 def notify_callbacks(
     payload: ProgressCallbackRequest,
     callbacks: list[CallbackSpec],
@@ -14,19 +27,13 @@ def notify_callbacks(
     if len(callbacks) == 0:
         return
 
+    json_payload = payload.model_dump(mode="json")
     for callback in callbacks:
-        # https://www.python-httpx.org/advanced/ssl/#configuring-client-instances
-        if callback.ca_cert:
-            ctx = ssl.create_default_context(cadata=callback.ca_cert)
-        else:
-            ctx = ssl.create_default_context(cafile=certifi.where())
-
         try:
-            httpx.post(
+            _get_callback_client(callback.ca_cert).post(
                 str(callback.url),
                 headers=callback.headers,
-                json=payload.model_dump(mode="json"),
-                verify=ctx,
+                json=json_payload,
             )
         except httpx.HTTPError as err:
             print(f"Error notifying callback {callback.url}: {err}")
@@ -1,23 +1,50 @@
 import asyncio
 import logging
+import os
+import shutil
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from typing import Optional
 
 from docling_serve.datamodel.convert import ConvertDocumentsOptions
 from docling_serve.datamodel.task import Task, TaskSource
 from docling_serve.docling_conversion import get_converter, get_pdf_pipeline_opts
-from docling_serve.engines.async_local.worker import AsyncLocalWorker
+from docling_serve.engines.async_local.worker import (
+    AsyncLocalWorker,
+    get_enabled_middlewares,
+    warm_up_middleware,
+)
 from docling_serve.engines.async_orchestrator import BaseAsyncOrchestrator
 from docling_serve.settings import docling_serve_settings
 
 _log = logging.getLogger(__name__)
 
 
+def _remove_scratch_dir(path: Path):
+    # The rename is a single syscall and takes the directory out of sight at once
+    trash_path = path.with_name(f"{path.name}.trash")
+    try:
+        os.rename(path, trash_path)
+    except OSError:
+        trash_path = path
+    shutil.rmtree(trash_path, ignore_errors=True)
+
+
 class AsyncLocalOrchestrator(BaseAsyncOrchestrator):
     def __init__(self):
         super().__init__()
         self.task_queue = asyncio.Queue()
         self.queue_list: list[str] = []
+        # Conversions get their own bounded pool instead of the loop's default executor
+        self.conversion_pool = ThreadPoolExecutor(
+            max_workers=docling_serve_settings.eng_loc_num_workers,
+            thread_name_prefix="conv",
+        )
+        self.cleanup_pool = ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix="cleanup"
+        )
+        self._pending_cleanups: set[asyncio.Future] = set()
 
     async def enqueue(
         self, sources: list[TaskSource], options: ConvertDocumentsOptions
@@ -38,6 +65,14 @@ class AsyncLocalOrchestrator(BaseAsyncOrchestrator):
             self.queue_list.index(task_id) + 1 if task_id in self.queue_list else None
         )
 
+    def schedule_cleanup(self, path: Path):
+        """Remove a scratch directory in the background without awaiting it."""
+        future = asyncio.get_running_loop().run_in_executor(
+            self.cleanup_pool, _remove_scratch_dir, path
+        )
+        self._pending_cleanups.add(future)
+        future.add_done_callback(self._pending_cleanups.discard)
+
     async def process_queue(self):
         # Create a pool of workers
         workers = []
@@ -48,10 +83,27 @@ class AsyncLocalOrchestrator(BaseAsyncOrchestrator):
             workers.append(worker_task)
 
         # Wait for all workers to complete (they won't, as they run indefinitely)
-        await asyncio.gather(*workers)
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            # Let running conversions finish, drop the ones not started yet
+            await asyncio.to_thread(
+                self.conversion_pool.shutdown, wait=True, cancel_futures=True
+            )
+            # Finish removing the scratch directories that are still pending
+            await asyncio.gather(*self._pending_cleanups, return_exceptions=True)
+            self.cleanup_pool.shutdown(wait=False)
         _log.debug("All workers completed.")
 
     async def warm_up_caches(self):
         # Converter with default options
         pdf_format_option = get_pdf_pipeline_opts(ConvertDocumentsOptions())
         get_converter(pdf_format_option)
+
+        # Load the models and tools of the enabled middlewares before the first task
+        await asyncio.gather(
+            *(
+                asyncio.to_thread(warm_up_middleware, middleware)
+                for middleware in get_enabled_middlewares()
+            )
+        )
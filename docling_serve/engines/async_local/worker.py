@@ -1,35 +1,44 @@
 import asyncio
 import logging
-import shutil
+import multiprocessing
+import os
 import time
-from typing import TYPE_CHECKING, Any, Optional, Union
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
+from typing import TYPE_CHECKING, Any, Optional, Union
 
 from fastapi.responses import FileResponse
 
 from docling.datamodel.base_models import DocumentStream
 
+from docling_serve.datamodel.convert import ConvertDocumentsOptions
 from docling_serve.datamodel.engines import TaskStatus
+from docling_serve.datamodel.responses import ConvertDocumentResponse
 from docling_serve.datamodel.requests import FileSource, HttpSource
-from docling_serve.docling_conversion import convert_documents
-from docling_serve.response_preparation import process_results
+from docling_serve.docling_conversion import (
+    convert_documents,
+    get_converter,
+    get_pdf_pipeline_opts,
+)
+from docling_serve.response_preparation import prepare_ai_vision_response, process_results
+from docling_serve.result_cache import (
+    get_result_cache_dir,
+    load_cached_result,
+    result_cache_key,
+    store_cached_result,
+)
 from docling_serve.storage import get_scratch
-from docling_serve.pdf_analysis import analyze_pdf_for_force_ocr, should_analyze_file_for_force_ocr, analyze_pdf
-from docling_serve.post_processing_bidi import MarkdownProcessor, BiDiProcessor
+from docling_serve.pdf_analysis import analyze_pdf_cached, should_analyze_file_for_force_ocr
+from docling_serve.post_processing_bidi import BiDiProcessor
+from docling_serve.settings import docling_serve_settings
 
 if TYPE_CHECKING:
     from docling_serve.engines.async_local.orchestrator import AsyncLocalOrchestrator
 
-from docling_serve.arabic_correction_middleware import ArabicCorrectionMiddleware
-from docling_serve.arabic_settings import ArabicCorrectionSettings
+from docling_serve.arabic_correction_middleware import get_arabic_middleware
 
-# Initialize Arabic correction settings and middleware
-arabic_settings = ArabicCorrectionSettings()
-arabic_middleware = ArabicCorrectionMiddleware(
-    enabled=arabic_settings.enabled,
-    ollama_host=arabic_settings.ollama_host,
-    model_name=arabic_settings.model_name
-)
+_log = logging.getLogger(__name__)
 
 # Initialize BiDi processor
 bidi_processor = BiDiProcessor(enabled=True)
@@ -51,13 +60,283 @@ except ImportError as e:
     _log.warning(f"OCRMyPDF middleware not available: {e}")
     ocrmypdf_middleware = None
 
-_log = logging.getLogger(__name__)
+
+def get_conversion_middlewares() -> list[Any]:
+    """Enabled middlewares that run inside _run_conversion."""
+    middlewares = [ai_vision_middleware, ocrmypdf_middleware]
+    return [m for m in middlewares if m is not None and m.enabled]
+
+
+def get_enabled_middlewares() -> list[Any]:
+    arabic_middleware = get_arabic_middleware()
+    if arabic_middleware is not None and arabic_middleware.enabled:
+        return [*get_conversion_middlewares(), arabic_middleware]
+    return get_conversion_middlewares()
+
+
+def warm_up_middleware(middleware: Any):
+    try:
+        middleware.warmup()
+    except Exception as e:
+        _log.warning(f"Warm-up of {type(middleware).__name__} failed: {e}")
+
+
+def _warm_up_conversion_process():
+    # Load the default converter once per process instead of on its first task.
+    # Arabic correction runs in the parent after the conversion, so only the
+    # middlewares used by _run_conversion are warmed here.
+    get_converter(get_pdf_pipeline_opts(ConvertDocumentsOptions()))
+    # This process is one of eng_loc_num_workers already, a nested OCRMyPDF
+    # pool would multiply the parallel files budget
+    if ocrmypdf_middleware is not None:
+        ocrmypdf_middleware.use_process_pool = False
+    for middleware in get_conversion_middlewares():
+        warm_up_middleware(middleware)
+
+
+@lru_cache
+def get_conversion_process_pool() -> ProcessPoolExecutor:
+    # Spawned (not forked) processes, so no event loop or thread state is inherited
+    return ProcessPoolExecutor(
+        max_workers=docling_serve_settings.eng_loc_num_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_warm_up_conversion_process,
+    )
+
+
+def _collect_convert_sources(
+    sources: list,
+) -> tuple[
+    list[Union[str, DocumentStream]],
+    Optional[dict[str, Any]],
+    list[tuple[int, DocumentStream]],
+]:
+    """Build the conversion sources, the request headers and the PDFs to analyze.
+
+    The PDFs to analyze are returned with their index in the conversion sources.
+    """
+    convert_sources: list[Union[str, DocumentStream]] = []
+    headers: Optional[dict[str, Any]] = None
+    analyzable: list[tuple[int, DocumentStream]] = []
+
+    for source in sources:
+        if isinstance(source, HttpSource):
+            convert_sources.append(str(source.url))
+            if headers is None and source.headers:
+                headers = source.headers
+            continue
+
+        if isinstance(source, FileSource):
+            source = source.to_document_stream()
+        elif not isinstance(source, DocumentStream):
+            continue
+
+        if should_analyze_file_for_force_ocr(source.name):
+            analyzable.append((len(convert_sources), source))
+        convert_sources.append(source)
+
+    return convert_sources, headers, analyzable
+
+
+# Task options read by the worker, with the value used when a field is missing
+_CONVERSION_FLAG_DEFAULTS: dict[str, Any] = {
+    'enable_ai_vision': False,
+    'enable_ocrmypdf_preprocessing': False,
+    'ocrmypdf_deskew': True,
+    'ocrmypdf_clean': True,
+    'ocr_lang': None,
+    'enable_arabic_correction': False,
+    'enable_bidi_processing': False,
+}
+
+
+def _extract_conversion_flags(options: ConvertDocumentsOptions) -> dict[str, Any]:
+    """Read the worker's task options once instead of at every use."""
+    return {
+        name: getattr(options, name, default)
+        for name, default in _CONVERSION_FLAG_DEFAULTS.items()
+    }
+
+
+def _run_conversion(
+    task_id: str,
+    convert_sources: list[Union[str, DocumentStream]],
+    headers: Optional[dict[str, Any]],
+    options: ConvertDocumentsOptions,
+    pdf_analyses: dict[int, dict[str, Any]],
+    work_dir: Path,
+) -> tuple[Any, ConvertDocumentsOptions]:
+    """Run the CPU-bound part of a task and return the response with the final options.
+
+    Kept at module level with plain arguments so it can be shipped to the
+    conversion process pool as well as run in a thread.
+    """
+    opts = _extract_conversion_flags(options)
+    # Gates that are fixed for the whole task are resolved once up front
+    use_ai_vision = (
+        opts['enable_ai_vision']
+        and ai_vision_middleware is not None
+        and ai_vision_middleware.enabled
+    )
+    use_ocrmypdf = (
+        opts['enable_ocrmypdf_preprocessing']
+        and ocrmypdf_middleware is not None
+        and ocrmypdf_middleware.enabled
+    )
+
+    # The first analyzed PDF decides force_ocr and AI Vision for the task
+    pdf_analysis_performed = False
+    recommended_ocr_mode = None  # Store the recommended mode for OCRMyPDF
+    ai_vision_triggered = False
+    
+    # Only the analyzed PDFs can decide, so visit just those in batch order
+    for index in sorted(pdf_analyses):
+        source = convert_sources[index]
+        analysis_results = pdf_analyses[index]
+        try:
+            recommended_ocr_mode = analysis_results['recommended_mode']
+            
+            # Check if AI Vision should be triggered
+            if (use_ai_vision and
+                recommended_ocr_mode == 'force' and
+                ai_vision_middleware.is_supported_file(source.name)):
+                
+                _log.info(f"AI Vision workflow triggered for {source.name} due to force OCR recommendation")
+                ai_vision_triggered = True
+                
+                # Process with AI Vision
+                try:
+                    source.stream.seek(0)  # Reset stream position
+                    markdown_content = ai_vision_middleware.process_document(
+                        source.stream, source.name
+                    )
+                    # Create a simple response structure for AI Vision
+                    response = prepare_ai_vision_response(
+                        markdown_content=markdown_content,
+                        filename=source.name,
+                        conversion_options=options
+                    )
+                    _log.info(f"AI Vision processing completed for {source.name}")
+                    return response, options
+                except Exception as e:
+                    _log.error(f"AI Vision processing failed for {source.name}: {e}")
+                    # Fall back to normal processing
+                    ai_vision_triggered = False
+            
+            # Update force_ocr based on analysis (only if not using AI Vision)
+            if not ai_vision_triggered:
+                should_force_ocr = True if recommended_ocr_mode == 'force' else False
+                if should_force_ocr and not options.force_ocr:
+                    options.force_ocr = True
+                    _log.info(f"PDF analysis enabled force_ocr for better OCR accuracy on {source.name}")
+            
+            _log.info(f"PDF analysis recommends OCR mode: {recommended_ocr_mode} for {source.name}")
+            pdf_analysis_performed = True
+            break
+                
+        except Exception as e:
+            _log.warning(f"Failed to analyze {source.name} for force_ocr: {e}")
+
+    if pdf_analysis_performed:
+        _log.info(f"Global PDF analysis completed for task {task_id}")
+    
+    # Add OCRMyPDF preprocessing - AFTER PDF analysis but BEFORE convert_documents
+    if use_ocrmypdf:
+        _log.info(f"Applying OCRMyPDF preprocessing for task {task_id}")
+
+        # Each file uses its own analysis, else the task-wide recommendation
+        stream_indexes = [
+            index for index, source in enumerate(convert_sources)
+            if isinstance(source, DocumentStream)
+        ]
+        ocr_modes = []
+        for index in stream_indexes:
+            source_analysis = pdf_analyses.get(index)
+            source_ocr_mode = (
+                source_analysis['recommended_mode']
+                if source_analysis is not None
+                else recommended_ocr_mode
+            )
+            ocr_modes.append(source_ocr_mode if source_ocr_mode != 'skip' else 'force')
+
+        # Small PDFs of the same OCR mode share one OCRMyPDF run, the other files
+        # run side by side in the middleware's process pool
+        original_streams = [convert_sources[index] for index in stream_indexes]
+        try:
+            preprocessed = ocrmypdf_middleware.preprocess_document_streams(
+                original_streams,
+                enable_preprocessing=True,
+                deskew=opts['ocrmypdf_deskew'],
+                clean=opts['ocrmypdf_clean'],
+                ocr_languages=opts['ocr_lang'],
+                ocr_modes=ocr_modes,
+            )
+        except Exception as e:
+            _log.error(f"OCRMyPDF preprocessing failed for task {task_id}: {e}")
+            preprocessed = original_streams
+
+        convert_sources = list(convert_sources)
+        ocrmypdf_processing_performed = False
+        for index, original, processed in zip(stream_indexes, original_streams, preprocessed):
+            if processed.stream is not original.stream:
+                convert_sources[index] = processed
+                ocrmypdf_processing_performed = True
+        
+        # IMPORTANT: Set force_ocr to False after successful OCRMyPDF preprocessing
+        # Since OCR was already performed by OCRMyPDF, we don't want docling to redo it
+        if ocrmypdf_processing_performed:
+            options.force_ocr = False
+            _log.info(f"Set force_ocr=False after OCRMyPDF preprocessing to avoid redundant OCR")
+    
+    # Note: results are only an iterator->lazy evaluation
+    results = convert_documents(
+        sources=convert_sources,
+        options=options,  # Now has force_ocr=False if OCRMyPDF was used
+        headers=headers,
+    )
+    
+    # The real processing will happen here
+    response = process_results(
+        conversion_options=options,
+        conv_results=results,
+        work_dir=work_dir,
+    )
+    _log.info(f"Task {task_id} completed with response: {response}")
+
+    return response, options
 
 
 class AsyncLocalWorker:
     def __init__(self, worker_id: int, orchestrator: "AsyncLocalOrchestrator"):
         self.worker_id = worker_id
         self.orchestrator = orchestrator
+
+    async def _analyze_sources(
+        self, eligible: list[tuple[int, DocumentStream]]
+    ) -> dict[int, dict[str, Any]]:
+        """Analyze all PDF sources concurrently, keyed by their index in the batch."""
+        if not eligible:
+            return {}
+
+        semaphore = asyncio.Semaphore(os.cpu_count() or 1)
+
+        async def analyze(source: DocumentStream) -> dict[str, Any]:
+            async with semaphore:
+                _log.info(f"Running global PDF analysis for {source.name}")
+                # Get full PDF analysis results (reused for identical uploads)
+                return await asyncio.to_thread(analyze_pdf_cached, source.stream)
+
+        results = await asyncio.gather(
+            *(analyze(source) for _, source in eligible), return_exceptions=True
+        )
+
+        pdf_analyses: dict[int, dict[str, Any]] = {}
+        for (index, source), result in zip(eligible, results):
+            if isinstance(result, Exception):
+                _log.warning(f"Failed to analyze {source.name} for force_ocr: {result}")
+                continue
+            pdf_analyses[index] = result
+        return pdf_analyses
         
     async def loop(self):
         _log.debug(f"Starting loop for worker {self.worker_id}")
@@ -74,201 +353,95 @@ class AsyncLocalWorker:
                 task.set_status(TaskStatus.STARTED)
                 _log.info(f"Worker {self.worker_id} processing task {task_id}")
                 
-                # Notify clients about task updates
-                await self.orchestrator.notify_task_subscribers(task_id)
-                # Notify clients about queue updates
-                await self.orchestrator.notify_queue_positions()
+                # Notify clients about task and queue updates
+                self.orchestrator.mark_task_dirty(task_id)
+                self.orchestrator.mark_queue_dirty()
                 
-                # Define a callback function to send progress updates to the client.
-                # TODO: send partial updates, e.g. when a document in the batch is done
-                def run_conversion():
-                    convert_sources: list[Union[str, DocumentStream]] = []
-                    headers: Optional[dict[str, Any]] = None
-                    
-                    for source in task.sources:
-                        if isinstance(source, DocumentStream):
-                            convert_sources.append(source)
-                        elif isinstance(source, FileSource):
-                            convert_sources.append(source.to_document_stream())
-                        elif isinstance(source, HttpSource):
-                            convert_sources.append(str(source.url))
-                            if headers is None and source.headers:
-                                headers = source.headers
-                    
-                    # GLOBAL PDF ANALYSIS - Run before any other processing
-                    pdf_analysis_performed = False
-                    recommended_ocr_mode = None  # Store the recommended mode for OCRMyPDF
-                    ai_vision_triggered = False
-                    
-                    for source in convert_sources:
-                        if isinstance(source, DocumentStream) and should_analyze_file_for_force_ocr(source.name):
-                            try:
-                                _log.info(f"Running global PDF analysis for {source.name}")
-                                # Create temporary file for full analysis
-                                import tempfile
-                                with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as temp_file:
-                                    temp_file.write(source.stream.getvalue())
-                                    temp_file.flush()
-                                    temp_path = Path(temp_file.name)
-                                
-                                try:
-                                    # Get full PDF analysis results
-                                    analysis_results = analyze_pdf(temp_path)
-                                    recommended_ocr_mode = analysis_results['recommended_mode']
-                                    
-                                    # Check if AI Vision should be triggered
-                                    enable_ai_vision = getattr(task.options, 'enable_ai_vision', False)
-                                    if (enable_ai_vision and
-                                        ai_vision_middleware and
-                                        ai_vision_middleware.enabled and
-                                        recommended_ocr_mode == 'force' and
-                                        ai_vision_middleware.is_supported_file(source.name)):
-                                        
-                                        _log.info(f"AI Vision workflow triggered for {source.name} due to force OCR recommendation")
-                                        ai_vision_triggered = True
-                                        
-                                        # Process with AI Vision
-                                        try:
-                                            source.stream.seek(0)  # Reset stream position
-                                            markdown_content = ai_vision_middleware.process_document(
-                                                source.stream, source.name
-                                            )
-                                            # Create a simple response structure for AI Vision
-                                            from docling_serve.response_preparation import prepare_ai_vision_response
-                                            response = prepare_ai_vision_response(
-                                                markdown_content=markdown_content,
-                                                filename=source.name,
-                                                conversion_options=task.options
-                                            )
-                                            _log.info(f"AI Vision processing completed for {source.name}")
-                                            return response
-                                        except Exception as e:
-                                            _log.error(f"AI Vision processing failed for {source.name}: {e}")
-                                            # Fall back to normal processing
-                                            ai_vision_triggered = False
-                                    
-                                    # Update force_ocr based on analysis (only if not using AI Vision)
-                                    if not ai_vision_triggered:
-                                        should_force_ocr = True if recommended_ocr_mode == 'force' else False
-                                        if should_force_ocr and not task.options.force_ocr:
-                                            updated_options = task.options.model_copy(update={'force_ocr': True})
-                                            task.options = updated_options
-                                            _log.info(f"PDF analysis enabled force_ocr for better OCR accuracy on {source.name}")
-                                    
-                                    _log.info(f"PDF analysis recommends OCR mode: {recommended_ocr_mode} for {source.name}")
-                                    pdf_analysis_performed = True
-                                    break
-                                    
-                                finally:
-                                    temp_path.unlink(missing_ok=True)
-                                    
-                            except Exception as e:
-                                _log.warning(f"Failed to analyze {source.name} for force_ocr: {e}")
-                    
-                    if pdf_analysis_performed:
-                        _log.info(f"Global PDF analysis completed for task {task_id}")
-                    
-                    # Add OCRMyPDF preprocessing - AFTER PDF analysis but BEFORE convert_documents
-                    enable_ocrmypdf = getattr(task.options, 'enable_ocrmypdf_preprocessing', False)
-                    if enable_ocrmypdf and ocrmypdf_middleware and ocrmypdf_middleware.enabled:
-                        _log.info(f"Applying OCRMyPDF preprocessing for task {task_id}")
-                        processed_sources = []
-                        ocrmypdf_processing_performed = False
-                        
-                        for source in convert_sources:
-                            if isinstance(source, DocumentStream):
-                                try:
-                                    # Get OCRMyPDF options from task options
-                                    ocrmypdf_deskew = getattr(task.options, 'ocrmypdf_deskew', True)
-                                    ocrmypdf_clean = getattr(task.options, 'ocrmypdf_clean', True)
-                                    ocr_languages = getattr(task.options, 'ocr_lang', None)
-                                    
-                                    # Use the recommended mode from PDF analysis
-                                    ocr_mode_to_use = recommended_ocr_mode if recommended_ocr_mode != 'skip' else 'force'
-                                    
-                                    # Apply preprocessing with the recommended mode
-                                    processed_stream = ocrmypdf_middleware.preprocess_file(
-                                        source.stream,
-                                        source.name,
-                                        deskew=ocrmypdf_deskew,
-                                        clean=ocrmypdf_clean,
-                                        ocr_languages=ocr_languages,
-                                        ocr_mode=ocr_mode_to_use
-                                    )
-                                    
-                                    # Reset stream position and create new DocumentStream
-                                    processed_stream.seek(0)
-                                    processed_sources.append(
-                                        DocumentStream(name=source.name, stream=processed_stream)
-                                    )
-                                    ocrmypdf_processing_performed = True
-                                    _log.info(f"OCRMyPDF preprocessing completed successfully for {source.name}")
-                                    
-                                except Exception as e:
-                                    _log.error(f"OCRMyPDF preprocessing failed for {source.name}: {e}")
-                                    processed_sources.append(source)
-                            else:
-                                processed_sources.append(source)
-                        
-                        convert_sources = processed_sources
-                        
-                        # IMPORTANT: Set force_ocr to False after successful OCRMyPDF preprocessing
-                        # Since OCR was already performed by OCRMyPDF, we don't want docling to redo it
-                        if ocrmypdf_processing_performed:
-                            updated_options = task.options.model_copy(update={'force_ocr': False})
-                            task.options = updated_options
-                            _log.info(f"Set force_ocr=False after OCRMyPDF preprocessing to avoid redundant OCR")
-                    
-                    # Note: results are only an iterator->lazy evaluation
-                    results = convert_documents(
-                        sources=convert_sources,
-                        options=task.options,  # Now has force_ocr=False if OCRMyPDF was used
-                        headers=headers,
+                # Decoding base64 file sources is CPU-bound, keep it off the event loop
+                convert_sources, headers, analyzable = await asyncio.to_thread(
+                    _collect_convert_sources, task.sources
+                )
+
+                def run_bidi_processing(response):
+                    try:
+                        _log.info(f"Applying BiDi text processing for task {task_id}")
+                        response = bidi_processor.process_conversion_result(response)
+                        _log.info(f"BiDi processing completed for task {task_id}")
+                    except Exception as e:
+                        _log.error(f"BiDi processing failed for task {task_id}: {e}", exc_info=True)
+                        # Continue without BiDi processing rather than failing the entire task
+                    return response
+
+                start_time = time.monotonic()
+                # Identical uploads with identical options skip analysis and conversion
+                cache_key = None
+                response = None
+                if get_result_cache_dir() is not None:
+                    cache_key = await asyncio.to_thread(
+                        result_cache_key, convert_sources, task.options
                     )
-                    
-                    # The real processing will happen here
+                    if cache_key is not None:
+                        response = await asyncio.to_thread(load_cached_result, cache_key)
+
+                if response is not None:
+                    _log.info(f"Task {task_id} served from the result cache")
+                else:
+                    # GLOBAL PDF ANALYSIS - Run before any other processing
+                    pdf_analyses = await self._analyze_sources(analyzable)
+
                     work_dir = get_scratch() / task_id
-                    response = process_results(
-                        conversion_options=task.options,
-                        conv_results=results,
-                        work_dir=work_dir,
+                    run_conversion = partial(
+                        _run_conversion,
+                        task_id,
+                        convert_sources,
+                        headers,
+                        task.options,
+                        pdf_analyses,
+                        work_dir,
                     )
-                    _log.info(f"Task {task_id} completed with response: {response}")
-                    
-                    # Apply Arabic correction if enabled and requested
-                    enable_arabic_correction = getattr(task.options, 'enable_arabic_correction', False)
-                    if enable_arabic_correction and arabic_middleware.enabled:
-                        try:
-                            _log.info(f"Applying Arabic OCR correction during async processing for task {task_id}")
-                            response = arabic_middleware.process_conversion_result(response)
-                        except Exception as e:
-                            _log.error(f"Arabic correction failed for task {task_id}: {e}", exc_info=True)
-                            # Continue without correction rather than failing the entire task
-                    
-                    # Apply BiDi processing if enabled and requested
-                    enable_bidi_processing = getattr(task.options, 'enable_bidi_processing', False)
-                    if enable_bidi_processing:
-                        try:
-                            _log.info(f"Applying BiDi text processing for task {task_id}")
-                            response = bidi_processor.process_conversion_result(response)
-                            _log.info(f"BiDi processing completed for task {task_id}")
-                        except Exception as e:
-                            _log.error(f"BiDi processing failed for task {task_id}: {e}", exc_info=True)
-                            # Continue without BiDi processing rather than failing the entire task
-
-                    if work_dir.exists():
-                        task.scratch_dir = work_dir
-                        if not isinstance(response, FileResponse):
+                    # Run the CPU-bound conversion in a process pool or the conversion threads
+                    if docling_serve_settings.eng_loc_use_process_pool:
+                        response, task.options = await asyncio.get_running_loop().run_in_executor(
+                            get_conversion_process_pool(), run_conversion
+                        )
+                    else:
+                        response, task.options = await asyncio.get_running_loop().run_in_executor(
+                            self.orchestrator.conversion_pool, run_conversion
+                        )
+                    # Even a stat can stall on a cold or network filesystem, keep it off the loop
+                    if await asyncio.to_thread(work_dir.exists):
+                        if isinstance(response, FileResponse):
+                            task.scratch_dir = work_dir
+                        else:
                             _log.warning(
                                 f"Task {task_id=} produced content in {work_dir=} but the response is not a file."
                             )
-                            shutil.rmtree(work_dir, ignore_errors=True)
-                    
-                    return response
-                
-                start_time = time.monotonic()
-                # Run in a thread
-                response = await asyncio.to_thread(run_conversion)
+                            # Removing many files is slow, don't hold the task for it
+                            self.orchestrator.schedule_cleanup(work_dir)
+
+                    if cache_key is not None and isinstance(response, ConvertDocumentResponse):
+                        try:
+                            await asyncio.to_thread(store_cached_result, cache_key, response)
+                        except Exception as e:
+                            _log.warning(f"Failed to cache the result of task {task_id}: {e}")
+
+                # Arabic correction is network-bound (LLM round-trips), so it runs as
+                # its own step once the conversion thread has been released.
+                opts = _extract_conversion_flags(task.options)
+                arabic_middleware = get_arabic_middleware() if opts['enable_arabic_correction'] else None
+                if arabic_middleware is not None and arabic_middleware.enabled:
+                    try:
+                        _log.info(f"Applying Arabic OCR correction during async processing for task {task_id}")
+                        response = await asyncio.to_thread(
+                            arabic_middleware.process_conversion_result, response
+                        )
+                    except Exception as e:
+                        _log.error(f"Arabic correction failed for task {task_id}: {e}", exc_info=True)
+                        # Continue without correction rather than failing the entire task
+
+                # BiDi reordering must see the corrected text, so it runs last
+                if opts['enable_bidi_processing']:
+                    response = await asyncio.to_thread(run_bidi_processing, response)
                 processing_time = time.monotonic() - start_time
                 
                 task.result = response
@@ -287,6 +460,9 @@ class AsyncLocalWorker:
                 task.set_status(TaskStatus.FAILURE)
                 
             finally:
-                await self.orchestrator.notify_task_subscribers(task_id)
+                self.orchestrator.mark_task_dirty(task_id)
                 self.orchestrator.task_queue.task_done()
-                _log.debug(f"Worker {self.worker_id} completely done with {task_id}")
\ No newline at end of file
+                _log.debug(f"Worker {self.worker_id} completely done with {task_id}")
+                # queue.get() does not suspend while tasks are waiting, so yield
+                # once here to let other handlers run between tasks
+                await asyncio.sleep(0)
\ No newline at end of file
@@ -2,7 +2,7 @@ import asyncio
 import datetime
 import logging
 import shutil
-from typing import Union
+from typing import Optional, Union
 
 from fastapi import BackgroundTasks, WebSocket
 from fastapi.responses import FileResponse
@@ -25,6 +25,11 @@ from docling_serve.settings import docling_serve_settings
 
 _log = logging.getLogger(__name__)
 
+# State changes within this window are sent to subscribers as one update
+NOTIFY_COALESCE_INTERVAL = 0.05
+# How often a long-polling status request re-checks its task
+TASK_STATUS_POLL_INTERVAL = 0.25
+
 
 class ProgressInvalid(OrchestratorError):
     pass
@@ -34,6 +39,9 @@ class BaseAsyncOrchestrator(BaseOrchestrator):
     def __init__(self):
         self.tasks: dict[str, Task] = {}
         self.task_subscribers: dict[str, set[WebSocket]] = {}
+        self._dirty_tasks: set[str] = set()
+        self._queue_dirty = False
+        self._flush_task: Optional[asyncio.Task] = None
 
     async def init_task_tracking(self, task: Task):
         task_id = task.task_id
@@ -46,7 +54,14 @@ class BaseAsyncOrchestrator(BaseOrchestrator):
         return self.tasks[task_id]
 
     async def task_status(self, task_id: str, wait: float = 0.0) -> Task:
-        return await self.get_raw_task(task_id=task_id)
+        # Long-poll: hold the request until the task completes or the wait is over
+        task = await self.get_raw_task(task_id=task_id)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + min(wait, docling_serve_settings.max_sync_wait)
+        while not task.is_completed() and loop.time() < deadline:
+            await asyncio.sleep(min(TASK_STATUS_POLL_INTERVAL, deadline - loop.time()))
+            task = await self.get_raw_task(task_id=task_id)
+        return task
 
     async def task_result(
         self, task_id: str, background_tasks: BackgroundTasks
@@ -123,5 +138,42 @@ class BaseAsyncOrchestrator(BaseOrchestrator):
 
             await self.notify_task_subscribers(task_id)
 
+    def mark_task_dirty(self, task_id: str):
+        """Schedule a coalesced status update for the subscribers of a task."""
+        self._dirty_tasks.add(task_id)
+        self._ensure_notification_flush()
+
+    def mark_queue_dirty(self):
+        """Schedule a coalesced status update for all pending tasks."""
+        self._queue_dirty = True
+        self._ensure_notification_flush()
+
+    def _ensure_notification_flush(self):
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_notifications())
+
+    async def _flush_notifications(self):
+        while self._dirty_tasks or self._queue_dirty:
+            await asyncio.sleep(NOTIFY_COALESCE_INTERVAL)
+
+            task_ids = self._dirty_tasks
+            self._dirty_tasks = set()
+            if self._queue_dirty:
+                self._queue_dirty = False
+                task_ids |= {
+                    task_id
+                    for task_id in self.task_subscribers.keys()
+                    if self.tasks[task_id].task_status == TaskStatus.PENDING
+                }
+
+            for task_id in task_ids:
+                # The task may have been deleted since it was marked
+                if task_id not in self.task_subscribers:
+                    continue
+                try:
+                    await self.notify_task_subscribers(task_id)
+                except Exception as e:
+                    _log.warning(f"Failed to notify subscribers of {task_id=}: {e}")
+
     async def receive_task_progress(self, request: ProgressCallbackRequest):
         raise NotImplementedError()
@@ -1,18 +1,24 @@
-import base64
+import atexit
+import contextlib
 import importlib
+import importlib.metadata
 import itertools
-import json
 import logging
 import os
 import ssl
 import tempfile
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from functools import lru_cache, wraps
 from pathlib import Path
 from typing import Optional
 
 import certifi
 import gradio as gr
 import httpx
+import orjson
 
 from docling.datamodel.base_models import FormatToExtensions
 from docling.datamodel.pipeline_options import (
@@ -147,6 +153,17 @@ file_output_path = None  # Will be set when a new file is generated
 #############
 
 
+def _require_package(name: str) -> str:
+    """Return the installed version of a package without importing it.
+
+    Raises ImportError when the package is missing, like the import would.
+    """
+    try:
+        return importlib.metadata.version(name)
+    except importlib.metadata.PackageNotFoundError:
+        raise ImportError(f"No module named '{name}'") from None
+
+
 def get_api_endpoint() -> str:
     protocol = "http"
     if uvicorn_settings.ssl_keyfile is not None:
@@ -154,7 +171,9 @@ def get_api_endpoint() -> str:
     return f"{protocol}://{docling_serve_settings.api_host}:{uvicorn_settings.port}"
 
 
+@lru_cache
 def get_ssl_context() -> ssl.SSLContext:
+    # Loading the CA bundle parses thousands of certificates, do it once per process
     ctx = ssl.create_default_context(cafile=certifi.where())
     kube_sa_ca_cert_path = Path(
         "/run/secrets/kubernetes.io/serviceaccount/service-ca.crt"
@@ -168,11 +187,61 @@ def get_ssl_context() -> ssl.SSLContext:
     return ctx
 
 
+@lru_cache
+def get_http_client() -> httpx.Client:
+    # One pooled client for all calls to the API, so connections and TLS sessions are reused
+    client = httpx.Client(
+        base_url=get_api_endpoint(),
+        verify=get_ssl_context(),
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+        timeout=httpx.Timeout(15.0, connect=5.0),
+    )
+    atexit.register(client.close)
+    return client
+
+
+@lru_cache(maxsize=4)
+def get_ollama_client(host: str):
+    # Each ollama.Client owns its own connection pool, so keep one per host alive
+    import ollama
+
+    return ollama.Client(host=host)
+
+
+# How long the result of a service status probe is reused before asking again
+STATUS_CACHE_TTL = 30.0
+
+
+def _ttl_cached(ttl: float):
+    """Cache the result of a probe without arguments for ``ttl`` seconds.
+
+    Calling the wrapped function with ``force=True`` refreshes the result.
+    """
+
+    def decorator(fn):
+        lock = threading.Lock()
+        state = {"expires": 0.0, "value": None}
+
+        @wraps(fn)
+        def wrapper(force: bool = False):
+            # Concurrent callers wait for one probe instead of starting their own
+            with lock:
+                if force or time.monotonic() >= state["expires"]:
+                    state["value"] = fn()
+                    state["expires"] = time.monotonic() + ttl
+                return state["value"]
+
+        return wrapper
+
+    return decorator
+
+
 def health_check():
-    response = httpx.get(f"{get_api_endpoint()}/health")
+    response = get_http_client().get("/health")
     if response.status_code == 200:
         return "Healthy"
     return "Unhealthy"
+@_ttl_cached(STATUS_CACHE_TTL)
 def check_arabic_correction_status():
     """Check if Arabic correction service is available using environment variables."""
     try:
@@ -193,8 +262,7 @@ def check_arabic_correction_status():
             return "<small style='color: gray;'>⚪ Arabic correction: Disabled</small>"
         
         # Try to connect to Ollama using configured host
-        import ollama
-        client = ollama.Client(host=ollama_host)
+        client = get_ollama_client(ollama_host)
         
         # Check if Ollama service is reachable
         models = client.list()
@@ -214,6 +282,7 @@ def check_arabic_correction_status():
         ollama_host = os.getenv("DOCLING_ARABIC_OLLAMA_HOST", "http://localhost:11434")
         return f"<small style='color: red;'>✗ Arabic correction: Cannot connect to {ollama_host}</small>"
 
+@lru_cache
 def get_arabic_correction_config():
     """Get Arabic correction configuration for display."""
     if arabic_settings:
@@ -229,6 +298,7 @@ def get_arabic_correction_config():
             "model": os.getenv("DOCLING_ARABIC_MODEL_NAME", "command-r7b-arabic"),
         }
     
+@lru_cache
 def get_ai_vision_config():
     """Get AI Vision configuration for display."""
     if ai_vision_settings:
@@ -244,9 +314,19 @@ def get_ai_vision_config():
             "model": os.getenv("DOCLING_AI_VISION_MODEL_NAME", "qwen2.5-vl:32b"),
         }
 
+@_ttl_cached(STATUS_CACHE_TTL)
 def validate_arabic_correction_environment():
     """Validate Arabic correction environment configuration."""
-    logger.debug("→ Enter validate_arabic_correction_environment")
+    return _check_arabic_correction_environment(deep=False)
+
+
+def _check_arabic_correction_environment(deep: bool = False):
+    """Check the Arabic correction setup.
+
+    The model smoke-test only runs when ``deep`` is set, since it has Ollama
+    load and query the model.
+    """
+    logger.debug("→ Enter _check_arabic_correction_environment")
     issues = []
     warnings = []
     config = get_arabic_correction_config()
@@ -263,8 +343,8 @@ def validate_arabic_correction_environment():
 
     # Check that required packages are installed
     try:
-        import ollama
-        import langdetect
+        _require_package("ollama")
+        _require_package("langdetect")
         logger.debug("Required packages (ollama, langdetect) imported successfully")
     except ImportError as e:
         missing = str(e).split("'")[1] if "'" in str(e) else "unknown package"
@@ -274,10 +354,9 @@ def validate_arabic_correction_environment():
 
     # Check Ollama connectivity and model availability
     try:
-        import requests
         health_url = f"{config['host']}/api/tags"
         logger.debug("Pinging Ollama health endpoint: %s", health_url)
-        resp = requests.get(health_url, timeout=10)
+        resp = get_http_client().get(health_url, timeout=10)
         logger.debug("Health check response code: %s", resp.status_code)
 
         if resp.status_code != 200:
@@ -285,7 +364,7 @@ def validate_arabic_correction_environment():
             logger.debug("Non-200 health check, aborting model list check")
         else:
             try:
-                client = ollama.Client(host=config["host"])
+                client = get_ollama_client(config["host"])
                 raw = client.list()
                 logger.debug("Raw client.list() output: %r", raw)
 
@@ -300,20 +379,20 @@ def validate_arabic_correction_environment():
                     entries = raw
                 logger.debug("Normalized entries: %r", entries)
 
-                available_models = []
-                for e in entries:
-                    # first look for `.model`, then `.name`, else fall back to str()
-                    name = getattr(e, "model", None) or getattr(e, "name", None) or str(e)
-                    available_models.append(name)
+                # first look for `.model`, then `.name`, else fall back to str()
+                available_models = {
+                    getattr(e, "model", None) or getattr(e, "name", None) or str(e)
+                    for e in entries
+                }
                 logger.debug("Available models list: %r", available_models)
 
                 present = config["model"] in available_models
                 logger.debug("Is configured model '%s' present? %s", config["model"], present)
                 if not present:
                     issues.append(f"Required model '{config['model']}' not found in Ollama")
-                    for m in available_models:
+                    for m in sorted(available_models):
                         logger.info("Ollama available model: %s", m)
-                else:
+                elif deep:
                     # quick smoke-test of the model
                     try:
                         test = client.chat(
@@ -331,10 +410,10 @@ def validate_arabic_correction_environment():
                 issues.append(f"Failed to check models in Ollama: {str(e)[:100]}")
                 logger.debug("Exception listing models: %s", e)
 
-    except requests.exceptions.Timeout:
+    except httpx.TimeoutException:
         issues.append(f"Timeout connecting to Ollama at {config['host']} (>10s)")
-        logger.debug("Requests Timeout connecting to %s", config['host'])
-    except requests.exceptions.ConnectionError:
+        logger.debug("Timeout connecting to %s", config['host'])
+    except httpx.ConnectError:
         issues.append(f"Cannot connect to Ollama at {config['host']} - is Ollama running?")
         logger.debug("ConnectionError connecting to %s", config['host'])
     except Exception as e:
@@ -358,25 +437,11 @@ def validate_arabic_correction_environment():
 
     return {"issues": issues, "warnings": warnings, "status": status}
 
-def validate_ai_vision_environment():
-    """Validate AI Vision environment configuration."""
-    validation_result = {
-        "status": "unknown",
-        "issues": [],
-        "warnings": [],
-        "info": []
-    }
-    
-    config = get_ai_vision_config()
+def validate_ai_vision_environment(deep: bool = False):
+    """Validate AI Vision environment configuration.
 
-    if not config["enabled"]:
-        validation_result["status"] = "disabled"
-        validation_result["info"].append("AI Vision is disabled in configuration")
-        return validation_result
-
-    # Check required packages
-def validate_ai_vision_environment():
-    """Validate AI Vision environment configuration."""
+    The model smoke-test only runs when ``deep`` is set.
+    """
     validation_result = {
         "status": "unknown",
         "issues": [],
@@ -405,16 +470,15 @@ def validate_ai_vision_environment():
 
     # Check Ollama connectivity and model availability
     try:
-        import requests
         health_url = f"{config['host']}/api/tags"
-        resp = requests.get(health_url, timeout=10)
+        resp = get_http_client().get(health_url, timeout=10)
 
         if resp.status_code != 200:
             validation_result["issues"].append(f"Ollama service at {config['host']} returned {resp.status_code}")
             validation_result["status"] = "error"
         else:
             try:
-                client = ollama.Client(host=config["host"])
+                client = get_ollama_client(config["host"])
                 raw = client.list()
 
                 # normalize into a list of model-entry objects
@@ -427,27 +491,28 @@ def validate_ai_vision_environment():
                 else:
                     entries = raw
 
-                available_models = []
-                for e in entries:
-                    # first look for `.model`, then `.name`, else fall back to str()
-                    name = getattr(e, "model", None) or getattr(e, "name", None) or str(e)
-                    available_models.append(name)
+                # first look for `.model`, then `.name`, else fall back to str()
+                available_models = {
+                    getattr(e, "model", None) or getattr(e, "name", None) or str(e)
+                    for e in entries
+                }
 
                 if config["model"] in available_models:
                     validation_result["status"] = "healthy"
                     validation_result["info"].append(f"Vision model '{config['model']}' is available")
                     
                     # Quick smoke-test of the model
-                    try:
-                        test = client.chat(
-                            model=config["model"],
-                            messages=[{"role": "user", "content": "test"}],
-                            options={"max_tokens": 1},
-                        )
-                        if not test:
-                            validation_result["warnings"].append(f"Model '{config['model']}' loaded but did not respond")
-                    except Exception as e:
-                        validation_result["warnings"].append(f"Model '{config['model']}' test failed: {str(e)[:100]}")
+                    if deep:
+                        try:
+                            test = client.chat(
+                                model=config["model"],
+                                messages=[{"role": "user", "content": "test"}],
+                                options={"max_tokens": 1},
+                            )
+                            if not test:
+                                validation_result["warnings"].append(f"Model '{config['model']}' loaded but did not respond")
+                        except Exception as e:
+                            validation_result["warnings"].append(f"Model '{config['model']}' test failed: {str(e)[:100]}")
                 else:
                     validation_result["issues"].append(f"Vision model '{config['model']}' not found in Ollama")
                     validation_result["status"] = "error"
@@ -455,10 +520,10 @@ def validate_ai_vision_environment():
                 validation_result["issues"].append(f"Failed to check models: {str(e)[:100]}")
                 validation_result["status"] = "error"
 
-    except requests.exceptions.Timeout:
+    except httpx.TimeoutException:
         validation_result["issues"].append(f"Timeout connecting to Ollama at {config['host']} (>10s)")
         validation_result["status"] = "error"
-    except requests.exceptions.ConnectionError:
+    except httpx.ConnectError:
         validation_result["issues"].append(f"Cannot connect to Ollama at {config['host']} - is Ollama running?")
         validation_result["status"] = "error"
     except Exception as e:
@@ -509,34 +574,7 @@ def get_ai_vision_status_with_validation():
     else:
         return f"<small style='color: green;'>✓ AI Vision: Ready ({config['model']})</small>"
 
-def get_detailed_arabic_correction_info():
-    """Get detailed Arabic correction information for the UI."""
-    validation_result = validate_arabic_correction_environment()
-    config = get_arabic_correction_config()
-    
-    info_html = f"""
-    <div style='font-size: 12px; margin-top: 10px;'>
-    <strong>Arabic OCR Correction Status:</strong><br>
-    <strong>Host:</strong> {config['host']}<br>
-    <strong>Model:</strong> {config['model']}<br>
-    <strong>Enabled:</strong> {config['enabled']}<br>
-    """
-    
-    if validation_result["issues"]:
-        info_html += "<br><strong style='color: red;'>Issues:</strong><br>"
-        for issue in validation_result["issues"]:
-            info_html += f"• {issue}<br>"
-    
-    if validation_result["warnings"]:
-        info_html += "<br><strong style='color: orange;'>Warnings:</strong><br>"
-        for warning in validation_result["warnings"]:
-            info_html += f"• {warning}<br>"
-    
-    if validation_result["status"] == "healthy":
-        info_html += "<br><strong style='color: green;'>✓ All checks passed</strong><br>"
-    
-    # Add configuration help
-    info_html += """
+_ARABIC_CONFIG_HELP_HTML = """
     <br><strong>Configuration:</strong><br>
     Set these environment variables:<br>
     • <code>DOCLING_ARABIC_ENABLED=true</code><br>
@@ -544,51 +582,77 @@ def get_detailed_arabic_correction_info():
     • <code>DOCLING_ARABIC_MODEL_NAME=command-r7b-arabic</code><br>
     </div>
     """
-    
-    return info_html
 
-def get_detailed_ai_vision_info():
-    """Get detailed AI Vision information for the UI."""
-    validation_result = validate_ai_vision_environment()
-    config = get_ai_vision_config()
+_AI_VISION_CONFIG_HELP_HTML = """
+    <br><strong>Configuration:</strong><br>
+    Set these environment variables:<br>
+    • <code>DOCLING_AI_VISION_ENABLED=true</code><br>
+    • <code>DOCLING_AI_VISION_OLLAMA_HOST=http://localhost:11434</code><br>
+    • <code>DOCLING_AI_VISION_MODEL_NAME=qwen2.5-vl:32b</code><br>
+    </div>
+    """
 
-    info_html = f"""
+
+def _config_header_html(title: str, config: dict) -> str:
+    return f"""
     <div style='font-size: 12px; margin-top: 10px;'>
-    <strong>AI Vision OCR Status:</strong><br>
+    <strong>{title}:</strong><br>
     <strong>Host:</strong> {config['host']}<br>
     <strong>Model:</strong> {config['model']}<br>
     <strong>Enabled:</strong> {config['enabled']}<br>
     """
 
+
+@lru_cache
+def _arabic_info_header_html() -> str:
+    return _config_header_html("Arabic OCR Correction Status", get_arabic_correction_config())
+
+
+@lru_cache
+def _ai_vision_info_header_html() -> str:
+    return _config_header_html("AI Vision OCR Status", get_ai_vision_config())
+
+
+def _validation_details_html(validation_result: dict) -> str:
+    """Render the issues, warnings and verdict of a validation result."""
+    parts = []
     if validation_result["issues"]:
-        info_html += "<br><strong style='color: red;'>Issues:</strong><br>"
-        for issue in validation_result["issues"]:
-            info_html += f"• {issue}<br>"
+        parts.append("<br><strong style='color: red;'>Issues:</strong><br>")
+        parts.extend(f"• {issue}<br>" for issue in validation_result["issues"])
 
     if validation_result["warnings"]:
-        info_html += "<br><strong style='color: orange;'>Warnings:</strong><br>"
-        for warning in validation_result["warnings"]:
-            info_html += f"• {warning}<br>"
+        parts.append("<br><strong style='color: orange;'>Warnings:</strong><br>")
+        parts.extend(f"• {warning}<br>" for warning in validation_result["warnings"])
 
     if validation_result["status"] == "healthy":
-        info_html += "<br><strong style='color: green;'>✓ All checks passed</strong><br>"
+        parts.append("<br><strong style='color: green;'>✓ All checks passed</strong><br>")
+    return "".join(parts)
 
-    # Add configuration help
-    info_html += """
-    <br><strong>Configuration:</strong><br>
-    Set these environment variables:<br>
-    • <code>DOCLING_AI_VISION_ENABLED=true</code><br>
-    • <code>DOCLING_AI_VISION_OLLAMA_HOST=http://localhost:11434</code><br>
-    • <code>DOCLING_AI_VISION_MODEL_NAME=qwen2.5-vl:32b</code><br>
-    </div>
-    """
 
-    return info_html
+def get_detailed_arabic_correction_info():
+    """Get detailed Arabic correction information for the UI."""
+    validation_result = validate_arabic_correction_environment()
+    # Only the validation part changes between calls, the rest is built once
+    return "".join((
+        _arabic_info_header_html(),
+        _validation_details_html(validation_result),
+        _ARABIC_CONFIG_HELP_HTML,
+    ))
+
+def get_detailed_ai_vision_info():
+    """Get detailed AI Vision information for the UI."""
+    validation_result = validate_ai_vision_environment()
+    return "".join((
+        _ai_vision_info_header_html(),
+        _validation_details_html(validation_result),
+        _AI_VISION_CONFIG_HELP_HTML,
+    ))
 
 def test_arabic_correction_connection():
     """Test Arabic correction connection and return user-friendly message."""
     try:
-        validation_result = validate_arabic_correction_environment()
+        # An explicit test must reach Ollama and the model, not the cached probe
+        validation_result = _check_arabic_correction_environment(deep=True)
         
         if validation_result["status"] == "healthy":
             return "✅ Arabic correction is working properly!"
@@ -607,7 +671,7 @@ def test_arabic_correction_connection():
 def test_ai_vision_connection():
     """Test AI Vision connection and return user-friendly message."""
     try:
-        validation_result = validate_ai_vision_environment()
+        validation_result = validate_ai_vision_environment(deep=True)
 
         if validation_result["status"] == "healthy":
             return "✅ AI Vision is working properly!"
@@ -626,7 +690,7 @@ def test_ai_vision_connection():
 def get_ocrmypdf_status_with_validation():
     """Get OCRMyPDF status with validation."""
     try:
-        import ocrmypdf
+        _require_package("ocrmypdf")
         
         # Use new settings system if available, fallback to legacy config
         if ocrmypdf_settings:
@@ -644,17 +708,18 @@ def get_ocrmypdf_status_with_validation():
     except Exception as e:
         return f'<span style="color: red;">❌ OCRMyPDF Error: {str(e)}</span>'
 
+@lru_cache
 def get_detailed_ocrmypdf_info():
     """Get detailed OCRMyPDF configuration information."""
     try:
-        import ocrmypdf
+        ocrmypdf_version = _require_package("ocrmypdf")
         
         if ocrmypdf_settings:
             info_html = f"""
             <div style="font-size: 12px; color: #666;">
                 <strong>OCRMyPDF Configuration:</strong><br/>
                 • Enabled: {'Yes' if ocrmypdf_settings.enabled else 'No'}<br/>
-                • Version: {ocrmypdf.__version__}<br/>
+                • Version: {ocrmypdf_version}<br/>
                 • Deskew: {ocrmypdf_settings.deskew}<br/>
                 • Clean: {ocrmypdf_settings.clean}<br/>
                 • Oversample: {ocrmypdf_settings.oversample}<br/>
@@ -678,7 +743,7 @@ def get_detailed_ocrmypdf_info():
             <div style="font-size: 12px; color: #666;">
                 <strong>OCRMyPDF Configuration (Legacy):</strong><br/>
                 • Enabled: {'Yes' if config['enabled'] else 'No'}<br/>
-                • Version: {ocrmypdf.__version__}<br/>
+                • Version: {ocrmypdf_version}<br/>
                 • Deskew: {'Yes' if config.get('deskew', True) else 'No'}<br/>
                 • Clean: {'Yes' if config.get('clean', True) else 'No'}<br/>
                 • Timeout: {config.get('timeout', 300)}s<br/>
@@ -696,7 +761,7 @@ def get_detailed_ocrmypdf_info():
 def test_ocrmypdf_connection():
     """Test OCRMyPDF functionality."""
     try:
-        import ocrmypdf
+        _require_package("ocrmypdf")
         import tempfile
         from pathlib import Path
         
@@ -758,8 +823,8 @@ def validate_ocrmypdf_environment():
     
     try:
         # Check if ocrmypdf package is installed
-        import ocrmypdf
-        validation_result["info"].append(f"OCRMyPDF version {ocrmypdf.__version__} is installed")
+        ocrmypdf_version = _require_package("ocrmypdf")
+        validation_result["info"].append(f"OCRMyPDF version {ocrmypdf_version} is installed")
         
         # Check settings availability
         if ocrmypdf_settings:
@@ -845,6 +910,17 @@ def clear_outputs():
     )
 
 
+def start_processing(label_text: gr.State, return_as_file):
+    """Reset the UI for a new submission in a single update."""
+    return (
+        set_options_visibility(False),
+        set_download_button_label(label_text),
+        *clear_outputs(),
+        set_task_id_visibility(True),
+        *set_outputs_visibility_process(return_as_file),
+    )
+
+
 def clear_url_input():
     return ""
 
@@ -869,30 +945,43 @@ def auto_set_return_as_file(
         return False
 
 
+# Default OCR languages suggested for each engine
+OCR_ENGINE_DEFAULT_LANGS = {
+    "easyocr": "en,fr,de,es",
+    "tesseract_cli": "eng,fra,deu,spa",
+    "tesseract": "eng,fra,deu,spa",
+    "rapidocr": "english,chinese",
+}
+
+
 def change_ocr_lang(ocr_engine):
-    if ocr_engine == "easyocr":
-        return "en,fr,de,es"
-    elif ocr_engine == "tesseract_cli":
-        return "eng,fra,deu,spa"
-    elif ocr_engine == "tesseract":
-        return "eng,fra,deu,spa"
-    elif ocr_engine == "rapidocr":
-        return "english,chinese"
+    return OCR_ENGINE_DEFAULT_LANGS.get(ocr_engine, "")
 
 
-def wait_task_finish(task_id: str, return_as_file: bool):
+# Seconds the status endpoint may hold a poll request open
+TASK_POLL_WAIT = 30
+# Upper bound for the delay between retries after a failed poll
+TASK_POLL_MAX_BACKOFF = 30.0
+# Seconds of consecutive failed polls before giving up on the task
+TASK_POLL_RETRY_DEADLINE = 300.0
+
+
+def wait_task_finish(task_id: str, return_as_file: bool, to_formats=None):
     conversion_sucess = False
     task_finished = False
     task_status = ""
-    ssl_ctx = get_ssl_context()
+    backoff = 1.0
+    failing_since = None
     while not task_finished:
         try:
-            response = httpx.get(
-                f"{get_api_endpoint()}/v1alpha/status/poll/{task_id}?wait=5",
-                verify=ssl_ctx,
-                timeout=15,
+            # The server holds the request until the task completes or the wait ends
+            response = get_http_client().get(
+                f"/v1alpha/status/poll/{task_id}?wait={TASK_POLL_WAIT}",
+                timeout=TASK_POLL_WAIT + 5,
             )
             task_status = response.json()["task_status"]
+            backoff = 1.0
+            failing_since = None
             if task_status == "success":
                 conversion_sucess = True
                 task_finished = True
@@ -901,7 +990,21 @@ def wait_task_finish(task_id: str, return_as_file: bool):
                 conversion_sucess = False
                 task_finished = True
                 raise RuntimeError(f"Task failed with status {task_status!r}")
-            time.sleep(5)
+        except httpx.TransportError as e:
+            # Connection problems are usually transient, retry with a growing delay
+            # until the API has been unreachable for too long
+            now = time.monotonic()
+            if failing_since is None:
+                failing_since = now
+            elif now - failing_since > TASK_POLL_RETRY_DEADLINE:
+                logger.error(f"Giving up polling task {task_id}: {e}")
+                raise gr.Error(
+                    f"Lost connection to the API while waiting for the task: {e}",
+                    print_exception=False,
+                )
+            logger.warning(f"Polling task {task_id} failed, retrying in {backoff:.0f}s: {e}")
+            time.sleep(backoff)
+            backoff = min(backoff * 2, TASK_POLL_MAX_BACKOFF)
         except Exception as e:
             logger.error(f"Error processing file(s): {e}")
             conversion_sucess = False
@@ -910,12 +1013,11 @@ def wait_task_finish(task_id: str, return_as_file: bool):
 
     if conversion_sucess:
         try:
-            response = httpx.get(
-                f"{get_api_endpoint()}/v1alpha/result/{task_id}",
-                timeout=15,
-                verify=ssl_ctx,
-            )
-            output = response_to_output(response, return_as_file)
+            # Streamed, so file results go to disk without being buffered first
+            with get_http_client().stream(
+                "GET", f"/v1alpha/result/{task_id}"
+            ) as response:
+                output = response_to_output(response, return_as_file, to_formats)
             return output
         except Exception as e:
             logger.error(f"Error getting task result: {e}")
@@ -925,6 +1027,29 @@ def wait_task_finish(task_id: str, return_as_file: bool):
     )
 
 
+def _error_detail(response: httpx.Response):
+    """Extract the error detail of a failed API call."""
+    # Proxies may answer with plain text or HTML instead of a JSON error
+    try:
+        return orjson.loads(response.content).get("detail", "An unknown error occurred.")
+    except (orjson.JSONDecodeError, AttributeError):
+        return response.text or "An unknown error occurred."
+
+
+def _conversion_options(
+    ocr_lang, enable_arabic_correction, enable_ai_vision, **options
+) -> dict:
+    """Build the options payload shared by URL and file submissions."""
+    # Features switched off in the server configuration are never requested
+    return {
+        **options,
+        "ocr_lang": _to_list_of_strings(ocr_lang),
+        "enable_arabic_correction": enable_arabic_correction
+        and get_arabic_correction_config()["enabled"],
+        "enable_ai_vision": enable_ai_vision and get_ai_vision_config()["enabled"],
+    }
+
+
 def process_url(
     input_sources,
     to_formats,
@@ -951,64 +1076,52 @@ def process_url(
     ai_vision_include_page_breaks=True,
     enable_bidi_processing=False
 ):
-    
-    # Check if Arabic correction is globally enabled via config
-    config = get_arabic_correction_config()
-    final_arabic_correction = enable_arabic_correction and config["enabled"]
-
-    # Check if AI Vision is globally enabled via config
-    ai_vision_config = get_ai_vision_config()
-    final_ai_vision = enable_ai_vision and ai_vision_config["enabled"]
+    # Blank entries (e.g. from a trailing comma) would only be rejected by the server
+    urls = [url.strip() for url in input_sources.split(",") if url.strip()]
+    if not urls:
+        logger.error("No input sources provided.")
+        raise gr.Error("No input sources provided.", print_exception=False)
 
     parameters = {
-        "http_sources": [{"url": source} for source in input_sources.split(",")],
-        "options": {
-            "to_formats": to_formats,
-            "image_export_mode": image_export_mode,
-            "pipeline": pipeline,
-            "ocr": ocr,
-            "force_ocr": force_ocr,
-            "ocr_engine": ocr_engine,
-            "ocr_lang": _to_list_of_strings(ocr_lang),
-            "pdf_backend": pdf_backend,
-            "table_mode": table_mode,
-            "abort_on_error": abort_on_error,
-            "return_as_file": return_as_file,
-            "do_code_enrichment": do_code_enrichment,
-            "do_formula_enrichment": do_formula_enrichment,
-            "do_picture_classification": do_picture_classification,
-            "do_picture_description": do_picture_description,
-            "enable_arabic_correction": final_arabic_correction,
-            "enable_ocrmypdf_preprocessing": enable_ocrmypdf_preprocessing,
-            "ocrmypdf_deskew": ocrmypdf_deskew,
-            "ocrmypdf_clean": ocrmypdf_clean,
-            "enable_ai_vision": final_ai_vision,
-            "ai_vision_preserve_formatting": ai_vision_preserve_formatting,
-            "ai_vision_include_page_breaks": ai_vision_include_page_breaks,
-            "enable_bidi_processing": enable_bidi_processing,
-        },
+        "http_sources": [{"url": url} for url in urls],
+        "options": _conversion_options(
+            to_formats=to_formats,
+            image_export_mode=image_export_mode,
+            pipeline=pipeline,
+            ocr=ocr,
+            force_ocr=force_ocr,
+            ocr_engine=ocr_engine,
+            ocr_lang=ocr_lang,
+            pdf_backend=pdf_backend,
+            table_mode=table_mode,
+            abort_on_error=abort_on_error,
+            return_as_file=return_as_file,
+            do_code_enrichment=do_code_enrichment,
+            do_formula_enrichment=do_formula_enrichment,
+            do_picture_classification=do_picture_classification,
+            do_picture_description=do_picture_description,
+            enable_arabic_correction=enable_arabic_correction,
+            enable_ocrmypdf_preprocessing=enable_ocrmypdf_preprocessing,
+            ocrmypdf_deskew=ocrmypdf_deskew,
+            ocrmypdf_clean=ocrmypdf_clean,
+            enable_ai_vision=enable_ai_vision,
+            ai_vision_preserve_formatting=ai_vision_preserve_formatting,
+            ai_vision_include_page_breaks=ai_vision_include_page_breaks,
+            enable_bidi_processing=enable_bidi_processing,
+        ),
     }
-    if (
-        not parameters["http_sources"]
-        or len(parameters["http_sources"]) == 0
-        or parameters["http_sources"][0]["url"] == ""
-    ):
-        logger.error("No input sources provided.")
-        raise gr.Error("No input sources provided.", print_exception=False)
     try:
-        ssl_ctx = get_ssl_context()
-        response = httpx.post(
-            f"{get_api_endpoint()}/v1alpha/convert/source/async",
-            json=parameters,
-            verify=ssl_ctx,
+        response = get_http_client().post(
+            "/v1alpha/convert/source/async",
+            content=orjson.dumps(parameters),
+            headers={"Content-Type": "application/json"},
             timeout=600,
         )
     except Exception as e:
         logger.error(f"Error processing URL: {e}")
         raise gr.Error(f"Error processing URL: {e}", print_exception=False)
     if response.status_code != 200:
-        data = response.json()
-        error_message = data.get("detail", "An unknown error occurred.")
+        error_message = _error_detail(response)
         logger.error(f"Error processing file: {error_message}")
         raise gr.Error(f"Error processing file: {error_message}", print_exception=False)
 
@@ -1016,12 +1129,6 @@ def process_url(
     return task_id_rendered
 
 
-def file_to_base64(file):
-    with open(file.name, "rb") as f:
-        encoded_string = base64.b64encode(f.read()).decode("utf-8")
-    return encoded_string
-
-
 def process_file(
     files,
     to_formats,
@@ -1051,65 +1158,57 @@ def process_file(
     if not files or len(files) == 0:
         logger.error("No files provided.")
         raise gr.Error("No files provided.", print_exception=False)
-    files_data = [
-        {"base64_string": file_to_base64(file), "filename": file.name} for file in files
-    ]
-
-    # Check if Arabic correction is globally enabled via config
-    config = get_arabic_correction_config()
-    final_arabic_correction = enable_arabic_correction and config["enabled"]
-
     # Check if OCRMyPDF is globally enabled via config
     ocrmypdf_config = get_ocrmypdf_config()
     final_ocrmypdf_preprocessing = enable_ocrmypdf_preprocessing and ocrmypdf_config["enabled"]
 
-    # Check if AI Vision is globally enabled via config
-    ai_vision_config = get_ai_vision_config()
-    final_ai_vision = enable_ai_vision and ai_vision_config["enabled"]
+    options = _conversion_options(
+        to_formats=to_formats,
+        image_export_mode=image_export_mode,
+        pipeline=pipeline,
+        ocr=ocr,
+        force_ocr=force_ocr,
+        ocr_engine=ocr_engine,
+        ocr_lang=ocr_lang,
+        pdf_backend=pdf_backend,
+        table_mode=table_mode,
+        abort_on_error=abort_on_error,
+        return_as_file=return_as_file,
+        do_code_enrichment=do_code_enrichment,
+        do_formula_enrichment=do_formula_enrichment,
+        do_picture_classification=do_picture_classification,
+        do_picture_description=do_picture_description,
+        enable_arabic_correction=enable_arabic_correction,
+        enable_ocrmypdf_preprocessing=final_ocrmypdf_preprocessing,
+        ocrmypdf_deskew=ocrmypdf_deskew,
+        ocrmypdf_clean=ocrmypdf_clean,
+        enable_ai_vision=enable_ai_vision,
+        ai_vision_preserve_formatting=ai_vision_preserve_formatting,
+        ai_vision_include_page_breaks=ai_vision_include_page_breaks,
+        enable_bidi_processing=enable_bidi_processing,
+    )
 
-    parameters = {
-        "file_sources": files_data,
-        "options": {
-            "to_formats": to_formats,
-            "image_export_mode": image_export_mode,
-            "pipeline": pipeline,
-            "ocr": ocr,
-            "force_ocr": force_ocr,
-            "ocr_engine": ocr_engine,
-            "ocr_lang": _to_list_of_strings(ocr_lang),
-            "pdf_backend": pdf_backend,
-            "table_mode": table_mode,
-            "abort_on_error": abort_on_error,
-            "return_as_file": return_as_file,
-            "do_code_enrichment": do_code_enrichment,
-            "do_formula_enrichment": do_formula_enrichment,
-            "do_picture_classification": do_picture_classification,
-            "do_picture_description": do_picture_description,
-            "enable_arabic_correction": final_arabic_correction,
-            "enable_ocrmypdf_preprocessing": final_ocrmypdf_preprocessing,
-            "ocrmypdf_deskew": ocrmypdf_deskew,
-            "ocrmypdf_clean": ocrmypdf_clean,
-            "enable_ai_vision": final_ai_vision,
-            "ai_vision_preserve_formatting": ai_vision_preserve_formatting,
-            "ai_vision_include_page_breaks": ai_vision_include_page_breaks,
-            "enable_bidi_processing": enable_bidi_processing,
-        },
-    }
+    # Form fields: lists are sent as repeated fields, unset options are left out
+    form_data = {key: value for key, value in options.items() if value is not None}
 
     try:
-        ssl_ctx = get_ssl_context()
-        response = httpx.post(
-            f"{get_api_endpoint()}/v1alpha/convert/source/async",
-            json=parameters,
-            verify=ssl_ctx,
-            timeout=600,
-        )
+        # Multipart upload streams the files from disk, no base64 copy in memory
+        with contextlib.ExitStack() as stack:
+            upload_files = [
+                ("files", (Path(file.name).name, stack.enter_context(open(file.name, "rb"))))
+                for file in files
+            ]
+            response = get_http_client().post(
+                "/v1alpha/convert/file/async",
+                data=form_data,
+                files=upload_files,
+                timeout=600,
+            )
     except Exception as e:
         logger.error(f"Error processing file(s): {e}")
         raise gr.Error(f"Error processing file(s): {e}", print_exception=False)
     if response.status_code != 200:
-        data = response.json()
-        error_message = data.get("detail", "An unknown error occurred.")
+        error_message = _error_detail(response)
         logger.error(f"Error processing file: {error_message}")
         raise gr.Error(f"Error processing file: {error_message}", print_exception=False)
 
@@ -1117,10 +1216,33 @@ def process_file(
     return task_id_rendered
 
 
-def response_to_output(response, return_as_file):
+# Size of the pieces a file result is written to disk in
+RESULT_DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Runs in the browser once the result arrived: pretty-prints the compact JSON and
+# fills the rendered Markdown, JSON and HTML views from the source views, so the
+# large contents cross the websocket only once and the server doesn't indent them.
+# The JSON view embeds the document and triggers its load via an image.
+RENDER_OUTPUTS_JS = """
+(markdown, json, html) => {
+    const pretty = json ? JSON.stringify(JSON.parse(json), null, 2) : "";
+    return [
+        pretty,
+        markdown,
+        pretty ? `
+            <docling-img id="dclimg" pagenumbers><docling-tooltip></docling-tooltip></docling-img>
+            <script id="dcljson" type="application/json" onload="document.getElementById('dclimg').src = JSON.parse(document.getElementById('dcljson').textContent);">${pretty}</script>
+            <img src onerror="document.getElementById('dclimg').src = JSON.parse(document.getElementById('dcljson').textContent);" />
+            ` : "",
+        html,
+    ];
+}
+"""
+
+
+def response_to_output(response, return_as_file, to_formats=None):
     markdown_content = ""
     json_content = ""
-    json_rendered_content = ""
     html_content = ""
     text_content = ""
     doctags_content = ""
@@ -1133,31 +1255,30 @@ def response_to_output(response, return_as_file):
         file_output_path = f"{tmp_output_dir}/{filename}"
         # logger.info(f"Saving file to: {file_output_path}")
         with open(file_output_path, "wb") as f:
-            f.write(response.content)
+            for chunk in response.iter_bytes(chunk_size=RESULT_DOWNLOAD_CHUNK_SIZE):
+                f.write(chunk)
         download_button = gr.DownloadButton(
             visible=True, label=f"Download {filename}", scale=1, value=file_output_path
         )
     else:
-        full_content = response.json()
-        markdown_content = full_content.get("document").get("md_content")
-        json_content = json.dumps(
-            full_content.get("document").get("json_content"), indent=2
-        )
-        # Embed document JSON and trigger load at client via an image.
-        json_rendered_content = f"""
-            <docling-img id="dclimg" pagenumbers><docling-tooltip></docling-tooltip></docling-img>
-            <script id="dcljson" type="application/json" onload="document.getElementById('dclimg').src = JSON.parse(document.getElementById('dcljson').textContent);">{json_content}</script>
-            <img src onerror="document.getElementById('dclimg').src = JSON.parse(document.getElementById('dcljson').textContent);" />
-            """
-        html_content = full_content.get("document").get("html_content")
-        text_content = full_content.get("document").get("text_content")
-        doctags_content = full_content.get("document").get("doctags_content")
+        # orjson ships with gradio and parses large documents much faster
+        document = orjson.loads(response.read()).get("document")
+        # Views of formats that weren't requested stay empty
+        requested = set(to_formats) if to_formats else {"md", "json", "html", "text", "doctags"}
+        if "md" in requested:
+            markdown_content = document.get("md_content")
+        if "json" in requested:
+            # Sent compact, RENDER_OUTPUTS_JS indents it in the browser
+            json_content = orjson.dumps(document.get("json_content")).decode("utf-8")
+        if "html" in requested:
+            html_content = document.get("html_content")
+        if "text" in requested:
+            text_content = document.get("text_content")
+        if "doctags" in requested:
+            doctags_content = document.get("doctags_content")
     return (
-        markdown_content,
         markdown_content,
         json_content,
-        json_rendered_content,
-        html_content,
         html_content,
         text_content,
         doctags_content,
@@ -1214,6 +1335,48 @@ log_arabic_correction_startup_status()
 log_ai_vision_startup_status()
 
 
+# Upper bound for a single status probe while rendering the status panels
+STATUS_PROBE_TIMEOUT = 15.0
+
+
+def refresh_all_status() -> dict[str, str]:
+    """Build all service status panels concurrently.
+
+    The probes hit different services, so the refresh takes as long as the
+    slowest one instead of their sum. A probe that hangs is reported as such
+    without holding back the others.
+    """
+    probes = {
+        "arabic_status": get_arabic_correction_status_with_validation,
+        "arabic_info": get_detailed_arabic_correction_info,
+        "ocrmypdf_status": get_ocrmypdf_status_with_validation,
+        "ocrmypdf_info": get_detailed_ocrmypdf_info,
+        "ai_vision_status": get_ai_vision_status_with_validation,
+        "ai_vision_info": get_detailed_ai_vision_info,
+    }
+    executor = ThreadPoolExecutor(max_workers=len(probes), thread_name_prefix="status")
+    futures = {name: executor.submit(probe) for name, probe in probes.items()}
+    deadline = time.monotonic() + STATUS_PROBE_TIMEOUT
+
+    results = {}
+    for name, future in futures.items():
+        try:
+            results[name] = future.result(timeout=max(0.0, deadline - time.monotonic()))
+        except FuturesTimeoutError:
+            logger.warning(f"Status probe {name} timed out")
+            results[name] = "<small style='color: red;'>✗ Status check timed out</small>"
+        except Exception as e:
+            logger.error(f"Status probe {name} failed: {e}")
+            results[name] = f"<small style='color: red;'>✗ Status check failed: {e}</small>"
+
+    # Don't wait for hung probes, they finish in the background
+    executor.shutdown(wait=False)
+    return results
+
+
+initial_status = refresh_all_status()
+
+
 ############
 # UI Setup #
 ############
@@ -1402,7 +1565,7 @@ with gr.Blocks(
             with gr.Column():
                 # Dynamic status with validation
                 arabic_correction_status = gr.HTML(
-                    value=get_arabic_correction_status_with_validation(),
+                    value=initial_status["arabic_status"],
                     visible=True
                 )
         # BiDi processing section
@@ -1423,7 +1586,7 @@ with gr.Blocks(
             with gr.Row():
                 with gr.Column(scale=2):
                     arabic_detailed_info = gr.HTML(
-                        value=get_detailed_arabic_correction_info(),
+                        value=initial_status["arabic_info"],
                         visible=True
                     )
                 with gr.Column(scale=1):
@@ -1449,7 +1612,7 @@ with gr.Blocks(
             with gr.Column():
                 # OCRMyPDF status
                 ocrmypdf_status = gr.HTML(
-                    value=get_ocrmypdf_status_with_validation(),
+                    value=initial_status["ocrmypdf_status"],
                     visible=True
                 )
 
@@ -1469,7 +1632,7 @@ with gr.Blocks(
                     )
                 with gr.Column():
                     ocrmypdf_detailed_info = gr.HTML(
-                        value=get_detailed_ocrmypdf_info(),
+                        value=initial_status["ocrmypdf_info"],
                         visible=True
                     )
                     test_ocrmypdf_btn = gr.Button(
@@ -1494,7 +1657,7 @@ with gr.Blocks(
             with gr.Column():
                 # Dynamic status with validation
                 ai_vision_status = gr.HTML(
-                    value=get_ai_vision_status_with_validation(),
+                    value=initial_status["ai_vision_status"],
                     visible=True
                 )
 
@@ -1503,7 +1666,7 @@ with gr.Blocks(
             with gr.Row():
                 with gr.Column(scale=2):
                     ai_vision_detailed_info = gr.HTML(
-                        value=get_detailed_ai_vision_info(),
+                        value=initial_status["ai_vision_info"],
                         visible=True
                     )
                 with gr.Column(scale=1):
@@ -1625,13 +1788,11 @@ with gr.Blocks(
 
     # URL processing
     url_process_btn.click(
-        set_options_visibility, inputs=[false_bool], outputs=[options]
-    ).then(
-        set_download_button_label, inputs=[processing_text], outputs=[download_file_btn]
-    ).then(
-        clear_outputs,
-        inputs=None,
+        start_processing,
+        inputs=[processing_text, return_as_file],
         outputs=[
+            options,
+            download_file_btn,
             task_id_rendered,
             output_markdown,
             output_markdown_rendered,
@@ -1641,11 +1802,10 @@ with gr.Blocks(
             output_html_rendered,
             output_text,
             output_doctags,
+            task_id_output,
+            content_output,
+            file_output,
         ],
-    ).then(
-        set_task_id_visibility,
-        inputs=[true_bool],
-        outputs=[task_id_output],
     ).then(
         process_url,
         inputs=[
@@ -1677,24 +1837,27 @@ with gr.Blocks(
         outputs=[
             task_id_rendered,
         ],
-    ).then(
-        set_outputs_visibility_process,
-        inputs=[return_as_file],
-        outputs=[content_output, file_output],
-    ).then(
+    ).success(
         wait_task_finish,
-        inputs=[task_id_rendered, return_as_file],
+        inputs=[task_id_rendered, return_as_file, to_formats],
         outputs=[
             output_markdown,
-            output_markdown_rendered,
             output_json,
-            output_json_rendered,
             output_html,
-            output_html_rendered,
             output_text,
             output_doctags,
             download_file_btn,
         ],
+    ).then(
+        None,
+        inputs=[output_markdown, output_json, output_html],
+        outputs=[
+            output_json,
+            output_markdown_rendered,
+            output_json_rendered,
+            output_html_rendered,
+        ],
+        js=RENDER_OUTPUTS_JS,
     )
 
     url_reset_btn.click(
@@ -1720,13 +1883,11 @@ with gr.Blocks(
 
     # File processing
     file_process_btn.click(
-        set_options_visibility, inputs=[false_bool], outputs=[options]
-    ).then(
-        set_download_button_label, inputs=[processing_text], outputs=[download_file_btn]
-    ).then(
-        clear_outputs,
-        inputs=None,
+        start_processing,
+        inputs=[processing_text, return_as_file],
         outputs=[
+            options,
+            download_file_btn,
             task_id_rendered,
             output_markdown,
             output_markdown_rendered,
@@ -1736,11 +1897,10 @@ with gr.Blocks(
             output_html_rendered,
             output_text,
             output_doctags,
+            task_id_output,
+            content_output,
+            file_output,
         ],
-    ).then(
-        set_task_id_visibility,
-        inputs=[true_bool],
-        outputs=[task_id_output],
     ).then(
         process_file,
         inputs=[
@@ -1772,24 +1932,27 @@ with gr.Blocks(
         outputs=[
             task_id_rendered,
         ],
-    ).then(
-        set_outputs_visibility_process,
-        inputs=[return_as_file],
-        outputs=[content_output, file_output],
-    ).then(
+    ).success(
         wait_task_finish,
-        inputs=[task_id_rendered, return_as_file],
+        inputs=[task_id_rendered, return_as_file, to_formats],
         outputs=[
             output_markdown,
-            output_markdown_rendered,
             output_json,
-            output_json_rendered,
             output_html,
-            output_html_rendered,
             output_text,
             output_doctags,
             download_file_btn,
         ],
+    ).then(
+        None,
+        inputs=[output_markdown, output_json, output_html],
+        outputs=[
+            output_json,
+            output_markdown_rendered,
+            output_json_rendered,
+            output_html_rendered,
+        ],
+        js=RENDER_OUTPUTS_JS,
     )
 
     file_reset_btn.click(
@@ -1,9 +1,12 @@
 """
 OCR Language utilities for converting between different OCR engine language codes.
 """
-from typing import List, Optional, Set
+from functools import lru_cache
+from typing import FrozenSet, List, Optional, Sequence, Tuple
 import logging
 
+_log = logging.getLogger(__name__)
+
 # Language mapping from common/EasyOCR codes to Tesseract codes
 LANGUAGE_MAPPING = {
     # Common ISO codes to Tesseract
@@ -98,7 +101,7 @@ LANGUAGE_MAPPING = {
 }
 
 # Valid Tesseract language codes (for validation)
-TESSERACT_CODES: Set[str] = {
+TESSERACT_CODES: FrozenSet[str] = frozenset({
     'afr', 'amh', 'ara', 'asm', 'aze', 'aze_cyrl', 'bel', 'ben', 'bod', 'bos',
     'bre', 'bul', 'cat', 'ceb', 'ces', 'chi_sim', 'chi_tra', 'chr', 'cym',
     'dan', 'deu', 'div', 'dzo', 'ell', 'eng', 'enm', 'epo', 'est', 'eus',
@@ -112,10 +115,10 @@ TESSERACT_CODES: Set[str] = {
     'sun', 'swa', 'swe', 'syr', 'tam', 'tat', 'tel', 'tgk', 'tgl', 'tha',
     'tir', 'ton', 'tur', 'uig', 'ukr', 'urd', 'uzb', 'uzb_cyrl', 'vie',
     'yid', 'yor'
-}
+})
 
 # EasyOCR supported language codes (for reference)
-EASYOCR_CODES: Set[str] = {
+EASYOCR_CODES: FrozenSet[str] = frozenset({
     'en', 'ch_sim', 'ch_tra', 'th', 'hi', 'ja', 'ko', 'vi', 'ar', 'bg', 'hr',
     'cs', 'da', 'nl', 'et', 'fi', 'fr', 'de', 'el', 'hu', 'is', 'it', 'lv',
     'lt', 'mt', 'no', 'pl', 'pt', 'ro', 'sk', 'sl', 'es', 'sv', 'tr', 'uk',
@@ -123,13 +126,44 @@ EASYOCR_CODES: Set[str] = {
     'pa', 'bn', 'as', 'or', 'ur', 'fa', 'he', 'my', 'lo', 'km', 'ka', 'am',
     'ti', 'mn', 'bo', 'dz', 'fo', 'gl', 'eu', 'ca', 'oc', 'br', 'co', 'io',
     'ia', 'ie', 'eo', 'vo', 'jbo', 'tlh'
+})
+
+# Supported codes per OCR engine, keyed by lowercase engine name.
+_VALID_CODES = {
+    'tesseract': TESSERACT_CODES,
+    'easyocr': EASYOCR_CODES,
 }
 
+# Shared result for requests without OCR languages.
+_EMPTY_RESULT: Tuple[str, ...] = ()
+
+# Any accepted code to its Tesseract code, so conversion is a single lookup.
+# Tesseract codes map to themselves and take precedence over LANGUAGE_MAPPING.
+_LANG_TO_TESSERACT = {**LANGUAGE_MAPPING, **{code: code for code in TESSERACT_CODES}}
+
+
+def _normalize_code(lang: str) -> str:
+    """Lowercase and strip a language code, reusing it when already normalized."""
+    if lang.islower() and not lang[0].isspace() and not lang[-1].isspace():
+        return lang
+    return lang.lower().strip()
+
+
+def _lookup_locale_code(lang: str) -> Optional[str]:
+    """Resolve locale-tagged codes such as 'zh_TW', 'en-US' or 'pt_BR'."""
+    # Mapped regional variants are written with '-', e.g. 'zh-tw'
+    hyphenated = lang.replace('_', '-')
+    tesseract_lang = _LANG_TO_TESSERACT.get(hyphenated)
+    if tesseract_lang is None:
+        # Otherwise fall back to the base language
+        tesseract_lang = _LANG_TO_TESSERACT.get(hyphenated.split('-', 1)[0])
+    return tesseract_lang
+
 
 def convert_to_tesseract_codes(
     ocr_languages: Optional[List[str]], 
     logger: Optional[logging.Logger] = None
-) -> List[str]:
+) -> Sequence[str]:
     """
     Convert language codes from EasyOCR/common format to Tesseract format.
     
@@ -138,60 +172,74 @@ def convert_to_tesseract_codes(
         logger: Optional logger for debug/warning messages
         
     Returns:
-        List of valid Tesseract language codes
+        Tuple of valid Tesseract language codes, shared with the conversion cache
     """
     if not ocr_languages:
-        return []
+        return _EMPTY_RESULT
     
     if logger is None:
-        logger = logging.getLogger(__name__)
-        
+        logger = _log
+
+    converted_languages, unknown_languages = _convert_language_codes(tuple(ocr_languages))
+
+    for lang in unknown_languages:
+        # Unknown language code - log warning but continue
+        logger.warning("Unknown language code '%s' - skipping", lang)
+
+    # Lazy %-formatting, this runs for every document of a batch
+    logger.debug("Converted languages %s to Tesseract format %s", ocr_languages, converted_languages)
+    logger.info("Final Tesseract language codes: %s", converted_languages)
+    return converted_languages
+
+
+@lru_cache(maxsize=128)
+def _convert_language_codes(
+    ocr_languages: Tuple[str, ...]
+) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """
+    Pure conversion behind convert_to_tesseract_codes, cached because a batch
+    reuses the same language list for every document.
+
+    Returns:
+        The unique Tesseract codes in input order, and the unknown codes
+    """
     converted_languages = []
-    
+    unknown_languages = []
+    seen = set()
+
     for lang in ocr_languages:
-        lang = lang.lower().strip()
-        
+        lang = _normalize_code(lang)
+
         # Skip empty strings
         if not lang:
             continue
-            
-        # Check if it's already a valid Tesseract code
-        if lang in TESSERACT_CODES:
-            converted_languages.append(lang)
-            logger.debug(f"Language '{lang}' already in Tesseract format")
+
+        tesseract_lang = _LANG_TO_TESSERACT.get(lang) or _lookup_locale_code(lang)
+        if tesseract_lang is None:
+            unknown_languages.append(lang)
             continue
-            
-        # Try to convert from common format to Tesseract
-        if lang in LANGUAGE_MAPPING:
-            tesseract_lang = LANGUAGE_MAPPING[lang]
-            converted_languages.append(tesseract_lang)
-            logger.debug(f"Converted language '{lang}' to Tesseract format '{tesseract_lang}'")
+
+        # Drop duplicates while preserving order
+        if tesseract_lang in seen:
             continue
-            
-        # Unknown language code - log warning but continue
-        logger.warning(f"Unknown language code '{lang}' - skipping")
-        
-    # Remove duplicates while preserving order
-    unique_languages = []
-    for lang in converted_languages:
-        if lang not in unique_languages:
-            unique_languages.append(lang)
-            
-    logger.info(f"Final Tesseract language codes: {unique_languages}")
-    return unique_languages
+        seen.add(tesseract_lang)
+        converted_languages.append(tesseract_lang)
 
+    return tuple(converted_languages), tuple(unknown_languages)
 
-def format_for_ocrmypdf(tesseract_languages: List[str]) -> str:
+
+def format_for_ocrmypdf(tesseract_languages: Sequence[str]) -> str:
     """
     Format Tesseract language codes for OCRMyPDF ('+' separated string).
     
     Args:
-        tesseract_languages: List of Tesseract language codes
+        tesseract_languages: Tesseract language codes, e.g. the cached tuple
+            from convert_to_tesseract_codes
         
     Returns:
-        String formatted for OCRMyPDF language parameter
+        String formatted for OCRMyPDF language parameter ('' when empty)
     """
-    return '+'.join(tesseract_languages) if tesseract_languages else ''
+    return '+'.join(tesseract_languages)
 
 
 def validate_language_codes(
@@ -214,28 +262,25 @@ def validate_language_codes(
         return []
     
     if logger is None:
-        logger = logging.getLogger(__name__)
+        logger = _log
     
-    if target_format.lower() == 'tesseract':
-        valid_codes = TESSERACT_CODES
-    elif target_format.lower() == 'easyocr':
-        valid_codes = EASYOCR_CODES
-    else:
-        logger.warning(f"Unknown target format '{target_format}', defaulting to Tesseract")
+    valid_codes = _VALID_CODES.get(target_format.lower())
+    if valid_codes is None:
+        logger.warning("Unknown target format '%s', defaulting to Tesseract", target_format)
         valid_codes = TESSERACT_CODES
     
     valid_languages = []
     for lang in languages:
-        lang = lang.lower().strip()
+        lang = _normalize_code(lang)
         if lang in valid_codes:
             valid_languages.append(lang)
         else:
-            logger.warning(f"Invalid {target_format} language code: '{lang}'")
+            logger.warning("Invalid %s language code: '%s'", target_format, lang)
     
     return valid_languages
 
 
-def get_supported_languages(engine: str = 'tesseract') -> Set[str]:
+def get_supported_languages(engine: str = 'tesseract') -> FrozenSet[str]:
     """
     Get supported language codes for a specific OCR engine.
     
@@ -243,11 +288,6 @@ def get_supported_languages(engine: str = 'tesseract') -> Set[str]:
         engine: OCR engine name ('tesseract', 'easyocr')
         
     Returns:
-        Set of supported language codes
+        Frozenset of supported language codes (shared, immutable)
     """
-    if engine.lower() == 'tesseract':
-        return TESSERACT_CODES.copy()
-    elif engine.lower() == 'easyocr':
-        return EASYOCR_CODES.copy()
-    else:
-        return set()
\ No newline at end of file
+    return _VALID_CODES.get(engine.lower(), frozenset())
\ No newline at end of file
@@ -1,12 +1,18 @@
-import tempfile
+import hashlib
 import logging
-from pathlib import Path
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
 from io import BytesIO
+from pathlib import Path
 from typing import List, Optional
 import ocrmypdf
 from docling.datamodel.base_models import DocumentStream
 
-from .ocr_language_utils import convert_to_tesseract_codes, format_for_ocrmypdf
+from .ocr_language_utils import convert_to_tesseract_codes
 
 # Import settings with proper fallback
 try:
@@ -14,20 +20,57 @@ try:
 except ImportError:
     ocrmypdf_settings = None
 
+# Integer verbosity setting to OCRMyPDF's Verbosity level
+_VERBOSITY_MAP = {
+    -1: ocrmypdf.Verbosity.quiet,
+    0: ocrmypdf.Verbosity.default,
+    1: ocrmypdf.Verbosity.debug,
+    2: ocrmypdf.Verbosity.debug_all,
+}
+
+# Middleware of a batch pool process, created by _init_pool_process
+_pool_middleware = None
+
+
+def _init_pool_process(settings):
+    global _pool_middleware
+    _pool_middleware = OCRMyPDFMiddleware(settings=settings)
+    _pool_middleware.use_process_pool = False
+
+
+def _preprocess_in_pool(data: bytes, filename: str, options: dict) -> Optional[bytes]:
+    """Preprocess one file in a pool process, None when the original is kept."""
+    stream = BytesIO(data)
+    processed = _pool_middleware.preprocess_file(stream, filename, **options)
+    return None if processed is stream else processed.getvalue()
+
+
 class OCRMyPDFMiddleware:
     def __init__(self, settings=None):
-        # Use provided settings or try to import from settings module
-        if settings is not None:
-            self.settings = settings
-        else:
-            try:
-                from .settings import ocrmypdf_settings
-                self.settings = ocrmypdf_settings
-            except (ImportError, AttributeError):
-                self.settings = None
+        # Use provided settings or the ones imported with the module
+        self.settings = settings if settings is not None else ocrmypdf_settings
         
         self.enabled = self.settings.enabled if self.settings else False
+        # OCRMyPDF arguments that only depend on the settings, shared by every file
+        self._base_ocrmypdf_args = self._settings_ocrmypdf_args() if self.settings else {}
+        # Lowercased once, so the per-file check is a single str.endswith call
+        self._supported_suffixes = tuple(
+            '.' + ext.lstrip('.').lower()
+            for ext in (self.settings.supported_extensions if self.settings else ())
+        )
+        # Size limit in bytes, compared against the buffer size of each file
+        self._max_file_bytes = int(self.settings.max_file_size_mb * 1024 * 1024) if self.settings else 0
+        self._batch_max_bytes = int(self.settings.batch_max_file_size_mb * 1024 * 1024) if self.settings else 0
         self.logger = logging.getLogger(__name__)
+        # Process pool for multi-file batches, created on first use. Turned off
+        # in processes that are themselves pool workers, so pools never nest.
+        self.use_process_pool = True
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._process_pool_lock = threading.Lock()
+        # On-disk cache of OCRMyPDF output, shared by all worker processes
+        self._cache_dir: Optional[Path] = self.settings.cache_path if self.settings else None
+        if self._cache_dir is not None:
+            self._cache_dir.mkdir(exist_ok=True, parents=True)
         
         # Configure OCRMyPDF logging if enabled
         if self.enabled and self.settings:
@@ -45,15 +88,7 @@ class OCRMyPDFMiddleware:
     def _configure_ocrmypdf_logging(self):
         """Configure OCRMyPDF logging based on verbosity settings."""
         try:
-            # Map integer verbosity to OCRMyPDF Verbosity enum
-            verbosity_map = {
-                -1: ocrmypdf.Verbosity.quiet,
-                0: ocrmypdf.Verbosity.default,
-                1: ocrmypdf.Verbosity.debug,
-                2: ocrmypdf.Verbosity.debug_all
-            }
-            
-            verbosity_level = verbosity_map.get(self.settings.verbosity, ocrmypdf.Verbosity.default)
+            verbosity_level = _VERBOSITY_MAP.get(self.settings.verbosity, ocrmypdf.Verbosity.default)
             
             # Configure OCRMyPDF logging
             ocrmypdf.configure_logging(
@@ -67,14 +102,124 @@ class OCRMyPDFMiddleware:
         except Exception as e:
             self.logger.warning(f"Failed to configure OCRMyPDF logging: {e}")
         
+    def _settings_ocrmypdf_args(self) -> dict:
+        """OCRMyPDF arguments taken as-is from the settings."""
+        args = {
+            'clean_final': self.settings.clean_final,
+            'optimize': self.settings.optimize,
+            'color_conversion_strategy': self.settings.color_conversion_strategy,
+            'oversample': self.settings.oversample,
+            'remove_background': self.settings.remove_background,
+            'skip_text': self.settings.skip_text,
+            'progress_bar': self.settings.progress_bar,
+            'jobs': self.settings.max_workers,
+            'use_threads': self.settings.use_threads,
+            'pdf_renderer': self.settings.pdf_renderer,
+            'output_type': self.settings.output_type,
+            'tesseract_oem': self.settings.tesseract_oem_mode,
+        }
+        # Enforced by OCRMyPDF on each Tesseract subprocess, so it also applies
+        # off the main thread and inside pool processes
+        if self.settings.tesseract_timeout is not None:
+            args['tesseract_timeout'] = self.settings.tesseract_timeout
+        return args
+
+    def warmup(self):
+        """Run a blank one-page PDF through OCRMyPDF to pay its first-call setup cost."""
+        import pikepdf
+
+        pdf = pikepdf.new()
+        pdf.add_blank_page(page_size=(72, 72))
+        blank = BytesIO()
+        pdf.save(blank)
+        # Straight to OCRMyPDF: through preprocess_file the output cache would
+        # answer every warm-up after the first one
+        ocrmypdf.ocr(
+            **self._base_ocrmypdf_args,
+            input_file=blank,
+            output_file=BytesIO(),
+            deskew=self.settings.deskew,
+            clean=self.settings.clean,
+            force_ocr=True,
+        )
+        self.logger.info("OCRMyPDF warm-up completed")
+
+    def max_parallel_files(self, count: int) -> int:
+        """Number of files to preprocess at the same time, out of ``count``.
+
+        Each OCRMyPDF run already uses ``max_workers`` jobs (all CPUs by default),
+        so unless ``parallel_files`` is set, files x jobs stays around the CPU count.
+        """
+        if not self.settings or not self.settings.parallel_processing:
+            return 1
+        limit = self.settings.parallel_files
+        if not limit:
+            cpus = os.cpu_count() or 1
+            limit = cpus // (self.settings.max_workers or cpus)
+        return max(1, min(count, limit))
+
+    def _cache_entry_path(self, file_stream: BytesIO, ocrmypdf_args: dict) -> Optional[Path]:
+        """Cache entry for this input and these OCRMyPDF arguments, None when caching is off."""
+        if self._cache_dir is None:
+            return None
+        digest = hashlib.blake2b(digest_size=32)
+        with file_stream.getbuffer() as view:
+            digest.update(view)
+        options = sorted(
+            (name, value) for name, value in ocrmypdf_args.items()
+            if name not in ('input_file', 'output_file')
+        )
+        digest.update(repr(options).encode("utf-8"))
+        return self._cache_dir / f"{digest.hexdigest()}.pdf"
+
+    def _load_cached_output(self, cache_path: Path) -> Optional[BytesIO]:
+        try:
+            output_stream = BytesIO(cache_path.read_bytes())
+            # Mark as recently used for the eviction order
+            os.utime(cache_path)
+            return output_stream
+        except FileNotFoundError:
+            return None
+
+    def _store_cached_output(self, cache_path: Path, output_stream: BytesIO):
+        try:
+            # Write then rename, so readers never see a partial entry
+            fd, tmp_path = tempfile.mkstemp(dir=self._cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f, output_stream.getbuffer() as view:
+                f.write(view)
+            os.replace(tmp_path, cache_path)
+
+            # Only stat the entries when some of them have to go
+            entries = list(self._cache_dir.glob("*.pdf"))
+            excess = len(entries) - self.settings.cache_max_entries
+            if excess > 0:
+                entries.sort(key=lambda p: p.stat().st_mtime)
+                for path in entries[:excess]:
+                    path.unlink(missing_ok=True)
+        except OSError as e:
+            self.logger.warning(f"Failed to cache OCRMyPDF output at {cache_path}: {e}")
+
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        # Conversion threads preprocess concurrently, only one may create the pool
+        with self._process_pool_lock:
+            if self._process_pool is None:
+                # Spawned processes, so each file's OCRMyPDF run and its Python-side
+                # PDF handling get their own interpreter
+                self._process_pool = ProcessPoolExecutor(
+                    max_workers=self.max_parallel_files(os.cpu_count() or 1),
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_pool_process,
+                    initargs=(self.settings,),
+                )
+            return self._process_pool
+
     def should_preprocess_file(self, filename: str) -> bool:
         """Check if file should be preprocessed with OCRMyPDF."""
         if not self.enabled or not self.settings:
             return False
             
         # Check file extension
-        file_ext = Path(filename).suffix.lower()
-        return file_ext in self.settings.supported_extensions
+        return filename.lower().endswith(self._supported_suffixes)
         
     def preprocess_file(
         self,
@@ -94,8 +239,10 @@ class OCRMyPDFMiddleware:
             return file_stream
             
         # Check file size
-        file_size_mb = len(file_stream.getvalue()) / (1024 * 1024)
-        if file_size_mb > self.settings.max_file_size_mb:
+        with file_stream.getbuffer() as view:
+            file_size = view.nbytes
+        file_size_mb = file_size / (1024 * 1024)
+        if file_size > self._max_file_bytes:
             self.logger.warning(f"File {filename} ({file_size_mb:.1f}MB) exceeds max size ({self.settings.max_file_size_mb}MB)")
             return file_stream
             
@@ -107,15 +254,10 @@ class OCRMyPDFMiddleware:
             use_clean = clean if clean is not None else self.settings.clean
             use_remove_background = self.settings.remove_background
             
-            # Create temporary files
-            with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as input_temp:
-                input_temp.write(file_stream.getvalue())
-                input_temp.flush()
-                input_path = Path(input_temp.name)
-                
-            with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as output_temp:
-                output_path = Path(output_temp.name)
-                
+            # OCRMyPDF reads the input stream and writes the result to the
+            # output stream itself, so no temporary files of our own are needed
+            output_stream = BytesIO()
+
             try:
                 # Use the provided OCR mode from PDF analysis, or default to 'force'
                 if ocr_mode is None:
@@ -138,56 +280,54 @@ class OCRMyPDFMiddleware:
                         use_force_ocr = True
                 
                 # Convert language codes to Tesseract format
-                tesseract_languages = convert_to_tesseract_codes(ocr_languages, self.logger)
+                tesseract_languages = (
+                    convert_to_tesseract_codes(ocr_languages, self.logger)
+                    if ocr_languages else ()
+                )
                 
                 # Configure OCRMyPDF using settings with valid parameters only
                 ocrmypdf_args = {
-                    'input_file': input_path,
-                    'output_file': output_path,
+                    **self._base_ocrmypdf_args,
+                    'input_file': file_stream,
+                    'output_file': output_stream,
                     'deskew': use_deskew,
                     'clean': use_clean,
-                    'clean_final': self.settings.clean_final,
-                    'optimize': self.settings.optimize,
-                    'color_conversion_strategy': self.settings.color_conversion_strategy,
-                    'oversample': self.settings.oversample,
-                    'remove_background': use_remove_background,
                     'force_ocr': use_force_ocr,
-                    'skip_text': self.settings.skip_text,
                     'redo_ocr': use_redo_ocr,
-                    'progress_bar': self.settings.progress_bar,
-                    'jobs': self.settings.max_workers,
-                    'use_threads': self.settings.use_threads,
-                    'pdf_renderer': self.settings.pdf_renderer,
-                    'output_type': self.settings.output_type,
-                    'tesseract_oem': self.settings.tesseract_oem_mode
-
                 }
 
                 # Add language specification if provided
                 if tesseract_languages:
                     ocrmypdf_args['language'] = tesseract_languages
-                    self.logger.info(f"Using OCRMyPDF with languages: {tesseract_languages}")
+                    self.logger.info("Using OCRMyPDF with languages: %s", tesseract_languages)
                 
                 # Log the final configuration for debugging
-                self.logger.debug(f"OCRMyPDF config: mode={ocr_mode}, deskew={use_deskew}, clean={use_clean}, "
-                                f"remove_background={use_remove_background}, redo_ocr={use_redo_ocr}, "
-                                f"force_ocr={use_force_ocr}")
+                self.logger.debug("OCRMyPDF config: mode=%s, deskew=%s, clean=%s, "
+                                  "remove_background=%s, redo_ocr=%s, force_ocr=%s",
+                                  ocr_mode, use_deskew, use_clean,
+                                  use_remove_background, use_redo_ocr, use_force_ocr)
                 
+                cache_path = self._cache_entry_path(file_stream, ocrmypdf_args)
+                if cache_path is not None:
+                    cached_stream = self._load_cached_output(cache_path)
+                    if cached_stream is not None:
+                        self.logger.info(f"Reusing cached OCRMyPDF output for {filename}")
+                        return cached_stream
+
                 # Run OCRMyPDF directly without custom timeout
+                file_stream.seek(0)
                 result = ocrmypdf.ocr(**ocrmypdf_args)
-                self.logger.debug(f"OCRMyPDF result: {result}")
-                
-                # Read the processed file
-                with open(output_path, 'rb') as f:
-                    processed_content = f.read()
-                    
+                self.logger.debug("OCRMyPDF result: %s", result)
+
                 self.logger.info(f"Successfully preprocessed {filename} with OCRMyPDF")
-                return BytesIO(processed_content)
+                if cache_path is not None:
+                    self._store_cached_output(cache_path, output_stream)
+                output_stream.seek(0)
+                return output_stream
                 
             finally:
-                # Cleanup temporary files
-                input_path.unlink(missing_ok=True)
-                output_path.unlink(missing_ok=True)
+                # Leave the original ready to be read again, e.g. as a fallback
+                file_stream.seek(0)
         except Exception as e:
             self.logger.error(f"OCRMyPDF preprocessing failed for {filename}: {e}")
                 
@@ -199,35 +339,85 @@ class OCRMyPDFMiddleware:
             else:
                 raise
             
-    def preprocess_document_streams(
-        self, 
-        file_sources: List[DocumentStream],
-        enable_preprocessing: bool = False,
-        deskew: Optional[bool] = None,
-        clean: Optional[bool] = None,
-        ocr_languages: Optional[List[str]] = None,
-        ocr_mode: Optional[str] = None,
+    def _is_small_pdf(self, source: DocumentStream) -> bool:
+        """Check if a source is small enough to share an OCRMyPDF run with others."""
+        if not self._batch_max_bytes or not source.name.lower().endswith('.pdf'):
+            return False
+        with source.stream.getbuffer() as view:
+            return view.nbytes <= self._batch_max_bytes
+
+    def _preprocess_small_files(
+        self, sources: List[DocumentStream], options: dict
+    ) -> Optional[List[Optional[DocumentStream]]]:
+        """
+        Run small PDFs through a single OCRMyPDF job and split the output again,
+        so OCRMyPDF's fixed start-up cost is paid once for all of them.
+
+        Returns None when the combined run didn't produce an output to split.
+        Files that can't be read are left out of the run and are None in the result.
+        """
+        import pikepdf
+
+        try:
+            combined = pikepdf.new()
+            # Position in sources and page count of each file in the combined PDF
+            batched = []
+            # Copied pages read their content from the source until saved
+            with ExitStack() as stack:
+                for position, source in enumerate(sources):
+                    source.stream.seek(0)
+                    try:
+                        pdf = stack.enter_context(pikepdf.open(source.stream))
+                    except Exception as e:
+                        # One broken file shouldn't fail the run of all the others
+                        self.logger.warning(f"Leaving {source.name} out of the OCRMyPDF batch: {e}")
+                        continue
+                    batched.append((position, len(pdf.pages)))
+                    combined.pages.extend(pdf.pages)
+                if len(batched) < 2:
+                    return None
+                combined_stream = BytesIO()
+                combined.save(combined_stream)
+
+            self.logger.info(f"Preprocessing {len(batched)} small PDFs in one OCRMyPDF run")
+            processed = self.preprocess_file(combined_stream, "batch.pdf", **options)
+            if processed is combined_stream:
+                return None
+
+            processed_sources: List[Optional[DocumentStream]] = [None] * len(sources)
+            with pikepdf.open(processed) as pdf:
+                if len(pdf.pages) != sum(count for _, count in batched):
+                    self.logger.warning("OCRMyPDF changed the page count of the batch, not splitting it")
+                    return None
+                start = 0
+                for position, count in batched:
+                    part = pikepdf.new()
+                    part.pages.extend(pdf.pages[start:start + count])
+                    start += count
+                    part_stream = BytesIO()
+                    part.save(part_stream)
+                    part_stream.seek(0)
+                    processed_sources[position] = DocumentStream(
+                        name=sources[position].name, stream=part_stream
+                    )
+            return processed_sources
+        except Exception as e:
+            self.logger.warning(f"Batched OCRMyPDF preprocessing failed, processing files one by one: {e}")
+            return None
+        finally:
+            for source in sources:
+                source.stream.seek(0)
+
+    def _preprocess_each(
+        self, file_sources: List[DocumentStream], options: List[dict]
     ) -> List[DocumentStream]:
-        """Preprocess multiple DocumentStream objects."""
-        if not enable_preprocessing or not self.enabled or not self.settings:
-            return file_sources
-            
-        processed_sources = []
-        for source in file_sources:
+        """Preprocess each source with its own OCRMyPDF run and options."""
+        def preprocess_source(source: DocumentStream, options: dict) -> DocumentStream:
             try:
-                processed_stream = self.preprocess_file(
-                    source.stream, 
-                    source.name,
-                    deskew=deskew,
-                    clean=clean,
-                    ocr_languages=ocr_languages,
-                    ocr_mode=ocr_mode
-                )
+                processed_stream = self.preprocess_file(source.stream, source.name, **options)
                 # Reset stream position
                 processed_stream.seek(0)
-                processed_sources.append(
-                    DocumentStream(name=source.name, stream=processed_stream)
-                )
+                return DocumentStream(name=source.name, stream=processed_stream)
             except Exception as e:
                 self.logger.error(f"Failed to preprocess {source.name}: {e}")
                 
@@ -235,6 +425,108 @@ class OCRMyPDFMiddleware:
                     raise
                 else:
                     # Use original source if preprocessing fails
-                    processed_sources.append(source)
-                
+                    return source
+
+        # Files OCRMyPDF would skip are neither counted nor copied to the pool
+        eligible = [
+            index for index, source in enumerate(file_sources)
+            if self.should_preprocess_file(source.name)
+        ]
+        if not self.use_process_pool or self.max_parallel_files(len(eligible)) == 1:
+            return [preprocess_source(source, opts) for source, opts in zip(file_sources, options)]
+
+        # Pool processes get plain bytes and hand back the processed bytes
+        pool = self._get_process_pool()
+        futures = {
+            index: pool.submit(
+                _preprocess_in_pool,
+                file_sources[index].stream.getvalue(),
+                file_sources[index].name,
+                options[index],
+            )
+            for index in eligible
+        }
+
+        # Collect in the original order of the sources
+        processed_sources = []
+        for index, source in enumerate(file_sources):
+            future = futures.get(index)
+            if future is None:
+                processed_sources.append(source)
+                continue
+            try:
+                processed = future.result()
+            except Exception as e:
+                self.logger.error(f"Failed to preprocess {source.name}: {e}")
+                if self.settings.fail_on_error:
+                    # Don't leave the other files queued in the pool
+                    for pending in futures.values():
+                        pending.cancel()
+                    raise
+                processed = None
+            if processed is None:
+                processed_sources.append(source)
+            else:
+                processed_sources.append(DocumentStream(name=source.name, stream=BytesIO(processed)))
+        return processed_sources
+
+    def preprocess_document_streams(
+        self, 
+        file_sources: List[DocumentStream],
+        enable_preprocessing: bool = False,
+        deskew: Optional[bool] = None,
+        clean: Optional[bool] = None,
+        ocr_languages: Optional[List[str]] = None,
+        ocr_mode: Optional[str] = None,
+        ocr_modes: Optional[List[Optional[str]]] = None,
+    ) -> List[DocumentStream]:
+        """
+        Preprocess multiple DocumentStream objects.
+
+        ``ocr_modes`` gives the OCR mode of each source and takes precedence
+        over ``ocr_mode``. Sources that were not preprocessed are returned as-is.
+        """
+        if not enable_preprocessing or not self.enabled or not self.settings:
+            return file_sources
+
+        if ocr_modes is None:
+            ocr_modes = [ocr_mode] * len(file_sources)
+        options = [
+            {
+                'deskew': deskew,
+                'clean': clean,
+                'ocr_languages': ocr_languages,
+                'ocr_mode': mode,
+            }
+            for mode in ocr_modes
+        ]
+        processed_sources = list(file_sources)
+        pending = list(range(len(file_sources)))
+
+        # Small PDFs in force mode share one OCRMyPDF run. Rebuilding them from
+        # their pages drops catalog-level data (outlines, forms, structure tree),
+        # which matters to the skip and redo modes that keep the existing text.
+        small = [
+            index for index in pending
+            if (ocr_modes[index] or 'force') == 'force'
+            and self._is_small_pdf(file_sources[index])
+        ]
+        if len(small) > 1:
+            batched = self._preprocess_small_files(
+                [file_sources[index] for index in small], options[small[0]]
+            )
+            if batched is not None:
+                batched_indexes = set()
+                for index, source in zip(small, batched):
+                    if source is not None:
+                        processed_sources[index] = source
+                        batched_indexes.add(index)
+                pending = [index for index in pending if index not in batched_indexes]
+
+        remaining = self._preprocess_each(
+            [file_sources[index] for index in pending],
+            [options[index] for index in pending],
+        )
+        for index, source in zip(pending, remaining):
+            processed_sources[index] = source
         return processed_sources
@@ -1,3 +1,5 @@
+from pathlib import Path
+from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import Optional, List
 
@@ -14,7 +16,7 @@ class OCRMyPDFSettings(BaseSettings):
     deskew: bool = True
     clean: bool = True
     optimize: int = 1
-    output_type: Optional[str] = None  # pdf, pdfa, pdfa-1, pdfa-2, pdfa-3
+    output_type: Optional[str] = "pdf"  # pdf, pdfa, pdfa-1, pdfa-2, pdfa-3 (PDF/A adds a Ghostscript pass)
     color_conversion_strategy: Optional[str] = None
     oversample: int = 300
     remove_background: bool = False # Changed to False because it is not yet implemented
@@ -30,6 +32,7 @@ class OCRMyPDFSettings(BaseSettings):
     
     # File processing settings
     max_file_size_mb: int = 200
+    batch_max_file_size_mb: float = 0  # Smaller PDFs in force mode share one OCRMyPDF run, 0 disables
     supported_extensions: List[str] = [".pdf"]
     
     # Error handling
@@ -40,6 +43,11 @@ class OCRMyPDFSettings(BaseSettings):
     parallel_processing: bool = True
     use_threads: Optional[bool] = None
     max_workers: Optional[int] = None
+    parallel_files: Optional[int] = None  # Files preprocessed at once, default CPUs / max_workers
+    
+    # Output cache, keyed by input content and OCRMyPDF arguments (disabled when unset)
+    cache_path: Optional[Path] = None
+    cache_max_entries: int = Field(default=100, gt=0)
     
     # Advanced OCRMyPDF options
     tesseract_timeout: Optional[float] = None
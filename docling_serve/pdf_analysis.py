@@ -1,19 +1,131 @@
+from collections import Counter, OrderedDict
 from io import BytesIO
+import hashlib
 import logging
+import os
 import re
+import threading
 from pathlib import Path
 import unicodedata
-from typing import Dict, Any, Optional
+from typing import BinaryIO, Dict, Any, List, Optional, Tuple, Union
 
 logger = logging.getLogger(__name__)
 
-def analyze_pdf(pdf_path: Path) -> Dict[str, Any]:
+# Bounded LRU of analysis results keyed by PDF content digest. Workers run
+# conversions in threads, so access is guarded by a lock.
+ANALYSIS_CACHE_SIZE = 64
+_analysis_cache: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+_analysis_cache_lock = threading.Lock()
+
+# Text quality patterns, compiled once
+_ESCAPE_SEQUENCE_RE = re.compile(r'\\[0-9a-fA-F]{2}')
+_SPACE_RUN_RE = re.compile(r'[ ]{1,10}')
+
+# /Marked entry of a catalog's MarkInfo, looked up in the end of the file
+_MARKED_RE = re.compile(rb'/Marked\s*(true|false)')
+TAG_SCAN_BYTES = 64 * 1024
+
+# pdfium ends lines with \r\n and marks soft hyphens with \x02, which would
+# count as control characters where pdfplumber gives \n and -
+_PDFIUM_TEXT_FIXES = str.maketrans({'\r': None, '\x02': '-'})
+
+
+def _fast_is_tagged(pdf_path: Union[Path, BinaryIO]) -> Optional[bool]:
+    """
+    Read the tagged flag from the last bytes of the PDF, where the catalog of
+    the latest revision usually is, without parsing the document.
+    
+    Returns:
+        The flag, or None when it isn't found there (e.g. the catalog sits in
+        a compressed object stream) and the PDF has to be parsed
+    """
+    try:
+        if hasattr(pdf_path, 'seek'):
+            size = pdf_path.seek(0, os.SEEK_END)
+            pdf_path.seek(max(0, size - TAG_SCAN_BYTES))
+            tail = pdf_path.read()
+            pdf_path.seek(0)
+        else:
+            with open(pdf_path, 'rb') as f:
+                size = f.seek(0, os.SEEK_END)
+                f.seek(max(0, size - TAG_SCAN_BYTES))
+                tail = f.read()
+    except OSError:
+        return None
+
+    matches = _MARKED_RE.findall(tail)
+    if not matches:
+        return None
+    # Incremental updates append catalogs, the last one is current
+    return matches[-1] == b'true'
+
+
+def _sampled_page_indexes(pages_total: int) -> List[int]:
+    """Pages used for quality analysis: the first five and every tenth of the document."""
+    step = max(1, int(pages_total / 10))
+    return [n for n in range(pages_total) if n < 5 or n % step == 0]
+
+
+def _extract_sampled_texts(pdf_path: Union[Path, BinaryIO]) -> Tuple[int, List[str]]:
+    """
+    Extract the text of the sampled pages, with pypdfium2's native text layer
+    when available, else with pdfplumber (which rebuilds the page layout).
+    
+    Returns:
+        The number of pages and the text of each sampled page
+    """
+    if hasattr(pdf_path, 'seek'):
+        pdf_path.seek(0)
+
+    try:
+        import pypdfium2 as pdfium
+        from docling.utils.locks import pypdfium2_lock
+    except ImportError:
+        pdfium = None
+
+    if pdfium is not None:
+        # pdfium is not thread-safe: analyses run in worker threads while docling
+        # converts in others, so every call goes through docling's global lock.
+        # It is taken per page, so running conversions only wait for one page.
+        with pypdfium2_lock:
+            pdf = pdfium.PdfDocument(pdf_path)
+        try:
+            with pypdfium2_lock:
+                pages_total = len(pdf)
+            texts = []
+            for page_num in _sampled_page_indexes(pages_total):
+                with pypdfium2_lock:
+                    page = pdf[page_num]
+                    textpage = page.get_textpage()
+                    try:
+                        text = textpage.get_text_range()
+                    finally:
+                        textpage.close()
+                        page.close()
+                texts.append(text.translate(_PDFIUM_TEXT_FIXES))
+            return pages_total, texts
+        finally:
+            with pypdfium2_lock:
+                pdf.close()
+
+    import pdfplumber
+
+    with pdfplumber.open(pdf_path) as pdf:
+        pages = pdf.pages
+        return len(pages), [
+            pages[page_num].extract_text() or ''
+            for page_num in _sampled_page_indexes(len(pages))
+        ]
+
+
+def analyze_pdf(pdf_path: Union[Path, BinaryIO]) -> Dict[str, Any]:
     """
     Analyze PDF to determine if it needs OCR and what type of OCR to apply.
     Works with multilingual documents including non-Latin scripts.
     
     Args:
-        pdf_path: Path to the PDF file to analyze
+        pdf_path: Path to the PDF file to analyze, or a seekable binary stream
+            with the PDF content (read in place, rewound before each parser)
         
     Returns:
         dict: Analysis results with the following keys:
@@ -32,16 +144,23 @@ def analyze_pdf(pdf_path: Path) -> Dict[str, Any]:
     }
     
     try:
-        # Try to use pikepdf for analysis
-        try:
-            from pikepdf import Pdf
-            with Pdf.open(pdf_path) as pdf:
-                # Check if PDF is tagged
-                if hasattr(pdf.Root, 'MarkInfo') and pdf.Root.MarkInfo.get('/Marked', False):
-                    result['is_tagged'] = True
-                    logger.info(f"PDF is tagged, likely created from an office document")
-        except ImportError:
-            logger.warning("pikepdf not available, cannot check if PDF is tagged")
+        # Check if PDF is tagged, from its last bytes when possible
+        is_tagged = _fast_is_tagged(pdf_path)
+        if is_tagged is not None:
+            result['is_tagged'] = is_tagged
+        else:
+            # Fall back to pikepdf for analysis
+            try:
+                from pikepdf import Pdf
+                if hasattr(pdf_path, 'seek'):
+                    pdf_path.seek(0)
+                with Pdf.open(pdf_path) as pdf:
+                    if hasattr(pdf.Root, 'MarkInfo') and pdf.Root.MarkInfo.get('/Marked', False):
+                        result['is_tagged'] = True
+            except ImportError:
+                logger.warning("pikepdf not available, cannot check if PDF is tagged")
+        if result['is_tagged']:
+            logger.info(f"PDF is tagged, likely created from an office document")
         
         # Text quality analysis
         pages_with_text = 0
@@ -49,32 +168,37 @@ def analyze_pdf(pdf_path: Path) -> Dict[str, Any]:
         text_samples = []
         poor_quality_indicators = 0
         
-        # Use pdfplumber to extract and analyze text
+        # Extract and analyze the text of a few sampled pages
         try:
-            import pdfplumber
-            
-            with pdfplumber.open(pdf_path) as pdf:
-                pages_total = len(pdf.pages)
-                for page_num, page in enumerate(pdf.pages):
-                    page_text = page.extract_text().strip()
-                    
-                    if len(page_text) > 0:
-                        pages_with_text += 1
-                        
-                        # Only sample a few pages for quality analysis
-                        if page_num < 5 or page_num % max(1, int(pages_total / 10)) == 0:
-                            text_samples.append(page_text[:2000])  # Sample first 2000 chars
+            pages_total, sampled_texts = _extract_sampled_texts(pdf_path)
+            for page_text in sampled_texts:
+                page_text = page_text.strip()
+                
+                if len(page_text) > 0:
+                    pages_with_text += 1
+                    text_samples.append(page_text[:2000])  # Sample first 2000 chars
                     
             # If we found text, analyze its quality using language-agnostic approaches
             if text_samples:
                 result['has_text'] = True
-                text_coverage = pages_with_text / max(pages_total, 1)
-                logger.info(f"PDF has text on {pages_with_text}/{pages_total} pages ({text_coverage:.1%})")
+                text_coverage = pages_with_text / max(len(sampled_texts), 1)
+                logger.info(f"PDF has text on {pages_with_text}/{len(sampled_texts)} sampled pages "
+                            f"of {pages_total} ({text_coverage:.1%})")
                 
                 # Analyze text quality using language-agnostic approaches
                 for sample in text_samples:
+                    # Classify each distinct character once rather than every occurrence
+                    char_counts = Counter(sample)
+                    control_chars = 0
+                    symbols = 0
+                    for c, count in char_counts.items():
+                        major_category = unicodedata.category(c)[0]
+                        if major_category == 'C':
+                            control_chars += count
+                        elif major_category in ('P', 'S'):
+                            symbols += count
+                    
                     # 1. Check for control characters (language-agnostic)
-                    control_chars = sum(1 for c in sample if unicodedata.category(c)[0] == 'C')
                     control_ratio = control_chars / max(len(sample), 1)
                     if control_ratio > 0.03:  # More than 3% control chars
                         poor_quality_indicators += 1
@@ -82,21 +206,20 @@ def analyze_pdf(pdf_path: Path) -> Dict[str, Any]:
                     
                     # 2. Check for high proportion of symbols/punctuation (language-agnostic)
                     # This works for most scripts as proper text generally has fewer symbols
-                    symbols = sum(1 for c in sample if unicodedata.category(c)[0] in ('P', 'S'))
                     symbol_ratio = symbols / max(len(sample), 1)
                     if symbol_ratio > 0.30:  # More than 30% symbols/punctuation
                         poor_quality_indicators += 1
                         logger.debug(f"High symbol/punctuation ratio: {symbol_ratio:.2f}")
                     
                     # 3. Check for escape sequences (language-agnostic, common in bad OCR)
-                    escape_sequences = len(re.findall(r'\\[0-9a-fA-F]{2}', sample))
+                    escape_sequences = len(_ESCAPE_SEQUENCE_RE.findall(sample))
                     if escape_sequences > 5:
                         poor_quality_indicators += 2  # Weight this higher
                         logger.debug(f"Found {escape_sequences} escape sequences")
                     
                     # 4. Check for space consistency (language-agnostic)
                     # Good OCR typically has consistent spacing between words/characters
-                    space_pattern = re.findall(r'[ ]{1,10}', sample)
+                    space_pattern = _SPACE_RUN_RE.findall(sample)
                     if space_pattern:
                         avg_space_len = sum(len(s) for s in space_pattern) / len(space_pattern)
                         # Unusual average space length or high variance indicates poor OCR
@@ -106,8 +229,9 @@ def analyze_pdf(pdf_path: Path) -> Dict[str, Any]:
                     
                     # 5. Check for unprintable characters or replacement characters
                     # Unicode replacement character � (U+FFFD) often indicates OCR failure
-                    if '\ufffd' in sample:
-                        poor_quality_indicators += len(re.findall('\ufffd', sample))
+                    replacement_chars = char_counts.get('\ufffd', 0)
+                    if replacement_chars:
+                        poor_quality_indicators += replacement_chars
                         logger.debug("Found Unicode replacement characters")
                 
                 # Determine text quality based on indicators
@@ -120,7 +244,7 @@ def analyze_pdf(pdf_path: Path) -> Dict[str, Any]:
                     logger.info(f"PDF contains text of reasonable quality (score: {quality_score:.2f})")
                 
         except ImportError:
-            logger.warning("pdfplumber not available, text quality analysis limited")
+            logger.warning("pypdfium2 and pdfplumber not available, text quality analysis limited")
         except Exception as e:
             logger.warning(f"Error during text quality analysis: {e}")
         
@@ -158,6 +282,10 @@ def check_pdf_is_tagged(pdf_path: Path) -> bool:
     Returns:
         bool: True if the PDF is tagged, False otherwise
     """
+    is_tagged = _fast_is_tagged(pdf_path)
+    if is_tagged is not None:
+        return is_tagged
+
     try:
         from pikepdf import Pdf
         with Pdf.open(pdf_path) as pdf:
@@ -168,6 +296,46 @@ def check_pdf_is_tagged(pdf_path: Path) -> bool:
     return False
 
 
+def pdf_content_digest(file_stream: BytesIO) -> bytes:
+    """Digest of the in-memory PDF content, computed without copying the buffer."""
+    with file_stream.getbuffer() as buffer:
+        return hashlib.blake2b(buffer, digest_size=32).digest()
+
+
+def analyze_pdf_cached(file_stream: BytesIO) -> Dict[str, Any]:
+    """
+    Analyze an in-memory PDF, reusing the result of a previous analysis of
+    identical content.
+    
+    Args:
+        file_stream: PDF file content as BytesIO
+        
+    Returns:
+        dict: Same analysis results as analyze_pdf
+    """
+    digest = pdf_content_digest(file_stream)
+    with _analysis_cache_lock:
+        cached = _analysis_cache.get(digest)
+        if cached is not None:
+            _analysis_cache.move_to_end(digest)
+            logger.info("Reusing cached PDF analysis result")
+            return dict(cached)
+
+    # pikepdf and pdfplumber both read the stream in place
+    try:
+        result = analyze_pdf(file_stream)
+    finally:
+        file_stream.seek(0)
+
+    with _analysis_cache_lock:
+        _analysis_cache[digest] = dict(result)
+        _analysis_cache.move_to_end(digest)
+        while len(_analysis_cache) > ANALYSIS_CACHE_SIZE:
+            _analysis_cache.popitem(last=False)
+
+    return result
+
+
 def analyze_pdf_for_force_ocr(file_stream: BytesIO, filename: str) -> bool:
     """
     Analyze PDF to determine if force_ocr should be enabled for docling.
@@ -182,29 +350,19 @@ def analyze_pdf_for_force_ocr(file_stream: BytesIO, filename: str) -> bool:
     logger.info(f"Analyzing PDF {filename} to determine force_ocr setting")
     
     try:
-        # Create temporary file for analysis
-        with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as temp_file:
-            temp_file.write(file_stream.getvalue())
-            temp_file.flush()
-            temp_path = Path(temp_file.name)
-            
-        try:
-            # Analyze the PDF
-            analysis = analyze_pdf(temp_path)
-            
-            # Determine force_ocr based on analysis
-            if analysis['recommended_mode'] == 'force':
-                logger.info(f"PDF analysis recommends force_ocr=True for {filename}")
-                return True
-            elif analysis['text_quality'] == 'poor':
-                logger.info(f"Poor text quality detected, setting force_ocr=True for {filename}")
-                return True
-            else:
-                logger.info(f"PDF analysis recommends keeping force_ocr=False for {filename}")
-                return False
-                
-        finally:
-            temp_path.unlink(missing_ok=True)
+        # Analyze the PDF
+        analysis = analyze_pdf_cached(file_stream)
+        
+        # Determine force_ocr based on analysis
+        if analysis['recommended_mode'] == 'force':
+            logger.info(f"PDF analysis recommends force_ocr=True for {filename}")
+            return True
+        elif analysis['text_quality'] == 'poor':
+            logger.info(f"Poor text quality detected, setting force_ocr=True for {filename}")
+            return True
+        else:
+            logger.info(f"PDF analysis recommends keeping force_ocr=False for {filename}")
+            return False
             
     except Exception as e:
         logger.warning(f"Failed to analyze PDF {filename}: {e}")
@@ -213,5 +371,4 @@ def analyze_pdf_for_force_ocr(file_stream: BytesIO, filename: str) -> bool:
 
 def should_analyze_file_for_force_ocr(filename: str) -> bool:
     """Check if file should be analyzed for force_ocr determination."""
-    file_ext = Path(filename).suffix.lower()
-    return file_ext == '.pdf'
\ No newline at end of file
+    return os.path.splitext(filename)[1].lower() == '.pdf'
\ No newline at end of file
@@ -4,87 +4,153 @@
 import re
 import sys
 import logging
+import unicodedata
+from functools import lru_cache
+from typing import Optional
+
+# The compiled bidi.get_display of python-bidi >= 0.5 does not mirror brackets in
+# RTL runs, bidi.algorithm does, so it is kept for correct output
 from bidi.algorithm import get_display
 
+# orjson parses bytes directly and is much faster on large documents
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    import json
+
+    _json_loads = json.loads
+
+    def _json_dumps(data) -> bytes:
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
 logger = logging.getLogger(__name__)
 
+
+def _plain_rtl_chars():
+    # Arabic letters, spaces and neutral punctuation: a line made only of these
+    # resolves entirely to level 1, so its visual order is the plain reversal.
+    # Harakat (NSM), digits (AN/EN) and mirrored brackets take the full algorithm.
+    candidates = (chr(c) for c in [*range(0x20, 0x7F), *range(0x0600, 0x0700)])
+    return [
+        c for c in candidates
+        if unicodedata.bidirectional(c) in ('AL', 'R', 'WS', 'ON', 'CS', 'ES', 'ET')
+        and not unicodedata.mirrored(c)
+    ]
+
+
+_PLAIN_RTL_CHARS = _plain_rtl_chars()
+_RTL_LETTERS = ''.join(
+    re.escape(c) for c in _PLAIN_RTL_CHARS if unicodedata.bidirectional(c) in ('AL', 'R')
+)
+_RTL_LETTER_RE = re.compile(f'[{_RTL_LETTERS}]')
+_PLAIN_RTL = ''.join(re.escape(c) for c in _PLAIN_RTL_CHARS)
+_NOT_PLAIN_RTL_RE = re.compile(f'[^{_PLAIN_RTL}]')
+
+
+@lru_cache(maxsize=4096)
+def _bidi_display(body: str) -> str:
+    # get_display is pure, so repeated bodies (table rows, headings) reuse its output
+    if _RTL_LETTER_RE.search(body) and not _NOT_PLAIN_RTL_RE.search(body):
+        return body[::-1]
+    return get_display(body)
+
+
+# Line boundaries as str.splitlines() sees them, \r\n counting as one
+LINE_SEPARATORS = ('\n', '\r', '\x0b', '\x0c', '\x1c', '\x1d', '\x1e', '\x85', '\u2028', '\u2029')
+LINE_BREAK_RE = re.compile(r'\r\n|[\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]')
+
+
+def has_arabic(text: str) -> bool:
+    # isascii() only reads a flag of the string, so pure-ASCII text is never scanned
+    return not text.isascii() and Line.ARABIC_RE.search(text) is not None
+
+
 class Line:
     """
     A single markdown line.  Flags RTL if it contains any Arabic,
     and can reverse+BiDi-reorder its content while preserving a
     leading markdown prefix.
     """
+    __slots__ = ('is_rtl', 'raw')
+
     ARABIC_RE = re.compile(r'[\u0600-\u06FF]')
+    # markdown markers (#, >, *, -, etc.), body, newline
+    LINE_RE = re.compile(
+        r'^(?P<prefix>\s*(?:#{1,6}\s+|[-+*]\s+|>\s*))?'
+        r'(?P<body>.*?)(?P<nl>\n?)$'
+    )
 
-    def __init__(self, raw: str):
+    def __init__(self, raw: str, is_rtl: Optional[bool] = None):
         self.raw = raw
-        self.is_rtl = bool(self.ARABIC_RE.search(raw))
+        # Callers that already searched the line pass the outcome along
+        if is_rtl is None:
+            is_rtl = not raw.isascii() and self.ARABIC_RE.search(raw) is not None
+        self.is_rtl = is_rtl
+
+    # first characters of the markdown markers matched by LINE_RE
+    MARKER_CHARS = frozenset('#>-+*')
 
     def reversed(self) -> str:
-        # capture markdown markers (#, >, *, -, etc.), body, newline
-        m = re.match(
-            r'^(?P<prefix>\s*(?:#{1,6}\s+|[-+*]\s+|>\s*))?'
-            r'(?P<body>.*?)(?P<nl>\n?)$',
-            self.raw
-        )
-        prefix = m.group('prefix') or ''
-        body   = m.group('body')   or ''
-        nl     = m.group('nl')     or ''
+        raw = self.raw
+        stripped = raw.lstrip()
+        if stripped and stripped[0] not in self.MARKER_CHARS:
+            # No marker possible, skip the regex: the body is the line minus its newline
+            prefix = ''
+            nl     = '\n' if raw.endswith('\n') else ''
+            body   = raw[:-1] if nl else raw
+        else:
+            m = self.LINE_RE.match(raw)
+            prefix = m.group('prefix') or ''
+            body   = m.group('body')   or ''
+            nl     = m.group('nl')     or ''
 
-        # 1) reverse the mirrored input
-        # rev = body[::-1]
-        # 2) apply full Unicode-BiDi to handle mixed runs
-        bidi_fixed = get_display(body)
+        # apply full Unicode-BiDi to handle mixed runs, it also takes care of
+        # mirroring so the body isn't reversed beforehand
+        bidi_fixed = _bidi_display(body)
 
         return prefix + bidi_fixed + nl
 
 
-class RTLBlock:
-    """Wraps consecutive RTL lines in <div dir="rtl">…</div>."""
-    def __init__(self):
-        self.lines = []
-
-    def add_line(self, line: Line):
-        self.lines.append(line)
-
-    def render(self) -> str:
-        # return self.lines
-        out = []
-        # out = ['<div dir="rtl">\n']
-        for ln in self.lines:
-            out.append(ln.reversed())
-        # out.append('</div>\n')
-        return ''.join(out)
-
-
-class MarkdownProcessor:
+def process_markdown(text: str) -> str:
     """
-    Walks a markdown document, groups RTL lines, and
-    emits a new doc with LTR lines untouched and RTL
-    blocks properly reversed+BiDi-wrapped.
+    Walks a markdown document in a single pass and emits a new
+    doc with LTR lines untouched and RTL lines reversed+BiDi-reordered.
     """
-    def __init__(self, text: str):
-        self.lines = [Line(l) for l in text.splitlines(keepends=True)]
-
-    def process(self) -> str:
-        out = []
-        rtl_block = None
-
-        for ln in self.lines:
-            if ln.is_rtl:
-                if rtl_block is None:
-                    rtl_block = RTLBlock()
-                rtl_block.add_line(ln)
-            else:
-                if rtl_block is not None:
-                    out.append(rtl_block.render())
-                    rtl_block = None
-                out.append(ln.raw)
+    search_arabic = Line.ARABIC_RE.search
+
+    # Nothing to reorder, hand back the original string without rebuilding it
+    if not has_arabic(text):
+        return text
+
+    # Walk the text from one RTL line to the next: the LTR text in between is
+    # copied as a single slice, only RTL lines are cut out and reordered.
+    # Markdown usually only breaks lines with '\n', then a line's bounds are
+    # a single rfind and find
+    separators = [sep for sep in LINE_SEPARATORS if sep in text]
+    newline_only = separators == ['\n']
+    out = []
+    pos = 0
+    match = search_arabic(text)
+    while match is not None:
+        hit = match.start()
+        if newline_only:
+            start = text.rfind('\n', pos, hit) + 1 or pos
+            end = text.find('\n', hit) + 1 or len(text)
+        else:
+            start = max([pos] + [text.rfind(sep, pos, hit) + 1 for sep in separators])
+            line_break = LINE_BREAK_RE.search(text, hit)
+            end = line_break.end() if line_break is not None else len(text)
 
-        if rtl_block is not None:
-            out.append(rtl_block.render())
+        out.append(text[pos:start])
+        out.append(Line(text[start:end], is_rtl=True).reversed())
+        pos = end
+        match = search_arabic(text, pos)
+    out.append(text[pos:])
 
-        return ''.join(out)
+    return ''.join(out)
 
 
 class BiDiProcessor:
@@ -94,45 +160,59 @@ class BiDiProcessor:
         self.enabled = enabled
         self.logger = logging.getLogger(__name__)
 
-    def _process_document_dict(self, document_dict):
+    def _process_markdown(self, original_markdown, processed_cache=None):
+        """Apply BiDi processing to markdown content, returning it with whether it changed."""
+        if not original_markdown or not isinstance(original_markdown, str):
+            return original_markdown, 0
+
+        # Without Arabic there is nothing to reorder, skip the processor and the cache
+        if not has_arabic(original_markdown):
+            self.logger.debug("No RTL content detected, markdown unchanged")
+            return original_markdown, 0
+
+        try:
+            # Identical markdown within a batch is only processed once
+            if processed_cache is not None and original_markdown in processed_cache:
+                processed_markdown = processed_cache[original_markdown]
+            else:
+                processed_markdown = process_markdown(original_markdown)
+                if processed_cache is not None:
+                    processed_cache[original_markdown] = processed_markdown
+            
+            # Only update if processing actually changed something
+            if processed_markdown != original_markdown:
+                self.logger.debug("BiDi processing applied to markdown content")
+                return processed_markdown, 1
+            self.logger.debug("No RTL content detected, markdown unchanged")
+                
+        except Exception as e:
+            self.logger.error(f"Error processing markdown content: {e}")
+
+        return original_markdown, 0
+
+    def _process_document_dict(self, document_dict, processed_cache=None):
         """Process a document dictionary and apply BiDi processing to markdown content."""
         if not isinstance(document_dict, dict):
             self.logger.warning(f"Expected document dict, got {type(document_dict)}")
             return document_dict, 0
         
-        bidi_applied = 0
-        
-        # Process markdown content if present
-        if "md_content" in document_dict and document_dict["md_content"]:
-            original_markdown = document_dict["md_content"]
-            if original_markdown and isinstance(original_markdown, str):
-                try:
-                    processor = MarkdownProcessor(original_markdown)
-                    processed_markdown = processor.process()
-                    
-                    # Only update if processing actually changed something
-                    if processed_markdown != original_markdown:
-                        document_dict["md_content"] = processed_markdown
-                        bidi_applied = 1
-                        self.logger.debug("BiDi processing applied to markdown content")
-                    else:
-                        self.logger.debug("No RTL content detected, markdown unchanged")
-                        
-                except Exception as e:
-                    self.logger.error(f"Error processing markdown content: {e}")
+        processed_markdown, bidi_applied = self._process_markdown(
+            document_dict.get("md_content"), processed_cache
+        )
+        if bidi_applied:
+            document_dict["md_content"] = processed_markdown
         
         return document_dict, bidi_applied
 
-    def _process_document_response(self, document):
+    def _process_document_response(self, document, processed_cache=None):
         """Process a document response object and apply BiDi processing."""
         if hasattr(document, '__dict__'):
-            # Convert object to dict, process, then update object
-            doc_dict = document.__dict__.copy()
-            processed_dict, bidi_applied = self._process_document_dict(doc_dict)
-            
-            # Update the original object
-            for key, value in processed_dict.items():
-                setattr(document, key, value)
+            # Only md_content can change, so update that attribute in place
+            processed_markdown, bidi_applied = self._process_markdown(
+                getattr(document, "md_content", None), processed_cache
+            )
+            if bidi_applied:
+                document.md_content = processed_markdown
                 
             return document, bidi_applied
         else:
@@ -146,16 +226,17 @@ class BiDiProcessor:
             return result
         
         self.logger.info("Starting BiDi processing of conversion result")
-        self.logger.debug(f"Result type: {type(result)}")
+        self.logger.debug("Result type: %s", type(result))
         
         documents_processed = 0
         bidi_applications = 0
+        processed_cache = {}
         
         try:
             # Handle response object with document attribute
             if hasattr(result, 'document') and result.document is not None:
                 self.logger.debug("Processing single document from result.document attribute")
-                corrected_document, doc_bidi = self._process_document_response(result.document)
+                corrected_document, doc_bidi = self._process_document_response(result.document, processed_cache)
                 
                 # Update the document in place
                 result.document = corrected_document
@@ -165,13 +246,17 @@ class BiDiProcessor:
             # Handle response object with documents attribute (list)
             elif hasattr(result, 'documents') and result.documents is not None:
                 doc_count = len(result.documents)
-                self.logger.debug(f"Processing {doc_count} documents from result.documents attribute")
+                self.logger.debug("Processing %d documents from result.documents attribute", doc_count)
                 
-                corrected_documents = []
+                corrected_documents = [None] * doc_count
                 for i, doc in enumerate(result.documents):
-                    self.logger.debug(f"Processing document {i+1}/{doc_count}")
-                    corrected_doc, doc_bidi = self._process_document_response(doc)
-                    corrected_documents.append(corrected_doc)
+                    self.logger.debug("Processing document %d/%d", i + 1, doc_count)
+                    # A failing document keeps its original content, the others go on
+                    try:
+                        corrected_documents[i], doc_bidi = self._process_document_response(doc, processed_cache)
+                    except Exception as e:
+                        self.logger.error(f"Error processing document {i+1}/{doc_count}: {e}")
+                        corrected_documents[i], doc_bidi = doc, 0
                     bidi_applications += doc_bidi
                     documents_processed += 1
                 
@@ -183,19 +268,23 @@ class BiDiProcessor:
                 
                 if "document" in result:
                     self.logger.debug("Processing single document from dictionary")
-                    result["document"], doc_bidi = self._process_document_dict(result["document"])
+                    result["document"], doc_bidi = self._process_document_dict(result["document"], processed_cache)
                     documents_processed = 1
                     bidi_applications = doc_bidi
                     
                 elif "documents" in result and isinstance(result["documents"], list):
                     doc_count = len(result["documents"])
-                    self.logger.debug(f"Processing {doc_count} documents from dictionary")
+                    self.logger.debug("Processing %d documents from dictionary", doc_count)
                     
-                    processed_docs = []
+                    processed_docs = [None] * doc_count
                     for i, doc in enumerate(result["documents"]):
-                        self.logger.debug(f"Processing document {i+1}/{doc_count}")
-                        processed_doc, doc_bidi = self._process_document_dict(doc)
-                        processed_docs.append(processed_doc)
+                        self.logger.debug("Processing document %d/%d", i + 1, doc_count)
+                        # A failing document keeps its original content, the others go on
+                        try:
+                            processed_docs[i], doc_bidi = self._process_document_dict(doc, processed_cache)
+                        except Exception as e:
+                            self.logger.error(f"Error processing document {i+1}/{doc_count}: {e}")
+                            processed_docs[i], doc_bidi = doc, 0
                         bidi_applications += doc_bidi
                         documents_processed += 1
                     
@@ -205,12 +294,11 @@ class BiDiProcessor:
             elif hasattr(result, 'body') or (hasattr(result, 'content') and hasattr(result, 'status_code')):
                 self.logger.debug("Processing JSON response object")
                 try:
-                    import json
-                    from fastapi.responses import JSONResponse
+                    from fastapi.responses import Response
                     
                     # Get the response data
                     if hasattr(result, 'body'):
-                        response_data = json.loads(result.body.decode('utf-8'))
+                        response_data = _json_loads(result.body)
                     elif callable(getattr(result, 'json', None)):
                         response_data = result.json()
                     else:
@@ -223,8 +311,13 @@ class BiDiProcessor:
                         documents_processed = 1
                         bidi_applications = doc_bidi
                     
-                    # Create new response with processed data
-                    result = JSONResponse(content=response_data)
+                    # Create new response with processed data, an unchanged body is kept as is
+                    if bidi_applications or not hasattr(result, 'body'):
+                        result = Response(
+                            content=_json_dumps(response_data),
+                            media_type="application/json",
+                            status_code=getattr(result, 'status_code', 200),
+                        )
                     
                 except Exception as e:
                     self.logger.error(f"Error processing JSON response: {e}")
@@ -247,7 +340,7 @@ def main():
 ## يكالهتسالا ليومتلا طباوضي
             """
     print("source: ", src)
-    result = MarkdownProcessor(src).process()
+    result = process_markdown(src)
     print("result: ",result)
 
 
@@ -0,0 +1,115 @@
+import hashlib
+import importlib.metadata
+import logging
+import os
+import tempfile
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Union
+
+from docling.datamodel.base_models import DocumentStream
+
+from docling_serve.datamodel.convert import ConvertDocumentsOptions
+from docling_serve.datamodel.responses import ConvertDocumentResponse
+from docling_serve.settings import (
+    ai_vision_settings,
+    docling_serve_settings,
+    ocrmypdf_settings,
+)
+
+_log = logging.getLogger(__name__)
+
+
+@lru_cache
+def get_result_cache_dir() -> Optional[Path]:
+    cache_dir = docling_serve_settings.result_cache_path
+    if cache_dir is not None:
+        cache_dir.mkdir(exist_ok=True, parents=True)
+    return cache_dir
+
+
+@lru_cache
+def server_fingerprint() -> bytes:
+    """Fingerprint the package versions and the server settings behind a result.
+
+    Mixed into every key, so upgrading docling or changing e.g. the OCRMyPDF
+    settings stops serving the conversions made with the previous ones.
+    """
+    digest = hashlib.blake2b(digest_size=32)
+    for package in ("docling", "docling-core", "docling-serve"):
+        try:
+            version = importlib.metadata.version(package)
+        except importlib.metadata.PackageNotFoundError:
+            version = ""
+        digest.update(f"{package}=={version}\n".encode())
+    digest.update(
+        docling_serve_settings.model_dump_json(
+            exclude={"result_cache_path", "result_cache_ttl", "result_cache_max_entries"}
+        ).encode("utf-8")
+    )
+    for settings in (ocrmypdf_settings, ai_vision_settings):
+        if settings is not None:
+            digest.update(settings.model_dump_json().encode("utf-8"))
+    return digest.digest()
+
+
+def result_cache_key(
+    sources: list[Union[str, DocumentStream]], options: ConvertDocumentsOptions
+) -> Optional[str]:
+    """Fingerprint the uploaded bytes and the options of a task, on this server.
+
+    Returns None when the result must not be cached: URL sources can change
+    behind the same address and AI Vision output is not deterministic.
+    """
+    if getattr(options, "enable_ai_vision", False):
+        return None
+
+    digest = hashlib.blake2b(digest_size=32)
+    digest.update(server_fingerprint())
+    for source in sources:
+        if not isinstance(source, DocumentStream):
+            return None
+        digest.update(source.name.encode("utf-8"))
+        digest.update(source.stream.getbuffer())
+    digest.update(options.model_dump_json().encode("utf-8"))
+    return digest.hexdigest()
+
+
+def load_cached_result(key: str) -> Optional[ConvertDocumentResponse]:
+    cache_dir = get_result_cache_dir()
+    if cache_dir is None:
+        return None
+
+    path = cache_dir / f"{key}.json"
+    try:
+        if time.time() - path.stat().st_mtime > docling_serve_settings.result_cache_ttl:
+            path.unlink(missing_ok=True)
+            return None
+        return ConvertDocumentResponse.model_validate_json(path.read_bytes())
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        _log.warning(f"Discarding unreadable cached result {path}: {e}")
+        path.unlink(missing_ok=True)
+        return None
+
+
+def store_cached_result(key: str, response: ConvertDocumentResponse):
+    cache_dir = get_result_cache_dir()
+    if cache_dir is None:
+        return
+
+    # Write then rename, so readers never see a partial entry
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        f.write(response.model_dump_json().encode("utf-8"))
+    os.replace(tmp_path, cache_dir / f"{key}.json")
+
+    # Only stat the entries when some of them have to go
+    entries = list(cache_dir.glob("*.json"))
+    excess = len(entries) - docling_serve_settings.result_cache_max_entries
+    if excess > 0:
+        entries.sort(key=lambda p: p.stat().st_mtime)
+        for path in entries[:excess]:
+            path.unlink(missing_ok=True)
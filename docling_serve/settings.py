@@ -2,7 +2,7 @@ import sys
 from pathlib import Path
 from typing import Optional, Union
 
-from pydantic import AnyUrl, model_validator
+from pydantic import AnyUrl, Field, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing_extensions import Self
 
@@ -42,6 +42,9 @@ class DoclingServeSettings(BaseSettings):
     scratch_path: Optional[Path] = None
     single_use_results: bool = True
     result_removal_delay: float = 300  # 5 minutes
+    result_cache_path: Optional[Path] = None
+    result_cache_ttl: float = 3_600 * 24  # 1 day
+    result_cache_max_entries: int = Field(default=1_000, gt=0)
     options_cache_size: int = 2
     enable_remote_services: bool = False
     allow_external_plugins: bool = False
@@ -59,6 +62,7 @@ class DoclingServeSettings(BaseSettings):
     eng_kind: AsyncEngine = AsyncEngine.LOCAL
     # Local engine
     eng_loc_num_workers: int = 2
+    eng_loc_use_process_pool: bool = False
     # KFP engine
     eng_kfp_endpoint: Optional[AnyUrl] = None
     eng_kfp_token: Optional[str] = None
@@ -1,3 +1,5 @@
+import os
+
 import ocrmypdf
 
 ocrmypdf.ocr(
@@ -5,7 +7,11 @@ ocrmypdf.ocr(
     "OCR Benchmarks/Doc 13-api.pdf",      # output
     language="eng+ara",
     deskew=True,
-    clean=True,
-    clean_final=True,
-    force_ocr=True
+    clean=True,                           # clean the pages Tesseract sees only
+    clean_final=False,                    # skip a second unpaper pass for the output
+    force_ocr=True,
+    jobs=os.cpu_count(),                  # OCR pages in parallel
+    tesseract_thread_limit=1,             # one thread per page, no oversubscription
+    optimize=1,
+    output_type="pdf",                    # skip the PDF/A conversion
 )
@@ -0,0 +1,115 @@
+import asyncio
+
+import pytest
+
+from docling_serve.datamodel.engines import TaskStatus
+from docling_serve.datamodel.task import Task
+from docling_serve.engines.async_orchestrator import BaseAsyncOrchestrator
+from docling_serve.settings import docling_serve_settings
+
+
+class DummyOrchestrator(BaseAsyncOrchestrator):
+    async def enqueue(self, sources, options):
+        raise NotImplementedError()
+
+    async def queue_size(self) -> int:
+        return 0
+
+    async def get_queue_position(self, task_id: str):
+        return None
+
+    async def process_queue(self):
+        pass
+
+    async def warm_up_caches(self):
+        pass
+
+
+async def make_orchestrator(*task_ids):
+    orchestrator = DummyOrchestrator()
+    for task_id in task_ids:
+        await orchestrator.init_task_tracking(Task(task_id=task_id, options=None))
+    return orchestrator
+
+
+@pytest.mark.asyncio
+async def test_status_returns_when_task_completes():
+    orchestrator = await make_orchestrator("task")
+    task = await orchestrator.get_raw_task("task")
+    loop = asyncio.get_running_loop()
+    loop.call_later(0.1, task.set_status, TaskStatus.SUCCESS)
+
+    started = loop.time()
+    result = await orchestrator.task_status("task", wait=10)
+
+    assert result.task_status == TaskStatus.SUCCESS
+    assert loop.time() - started < 1
+
+
+@pytest.mark.asyncio
+async def test_status_wait_is_capped(monkeypatch):
+    monkeypatch.setattr(docling_serve_settings, "max_sync_wait", 0.3)
+    orchestrator = await make_orchestrator("task")
+    loop = asyncio.get_running_loop()
+
+    started = loop.time()
+    result = await orchestrator.task_status("task", wait=60)
+
+    assert result.task_status == TaskStatus.PENDING
+    assert 0.3 <= loop.time() - started < 1
+
+
+@pytest.mark.asyncio
+async def test_status_without_wait_returns_immediately():
+    orchestrator = await make_orchestrator("task")
+    loop = asyncio.get_running_loop()
+
+    started = loop.time()
+    result = await orchestrator.task_status("task")
+
+    assert result.task_status == TaskStatus.PENDING
+    assert loop.time() - started < 0.1
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+        self.closed = False
+
+    async def send_text(self, text):
+        self.sent.append(text)
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.mark.asyncio
+async def test_marks_within_window_send_one_update():
+    orchestrator = await make_orchestrator("task")
+    websocket = FakeWebSocket()
+    orchestrator.task_subscribers["task"].add(websocket)
+
+    orchestrator.mark_task_dirty("task")
+    orchestrator.mark_task_dirty("task")
+    orchestrator.mark_queue_dirty()
+    await orchestrator._flush_task
+
+    assert len(websocket.sent) == 1
+
+
+@pytest.mark.asyncio
+async def test_task_deleted_before_flush_is_skipped():
+    orchestrator = await make_orchestrator("deleted", "kept")
+    deleted_websocket = FakeWebSocket()
+    kept_websocket = FakeWebSocket()
+    orchestrator.task_subscribers["deleted"].add(deleted_websocket)
+    orchestrator.task_subscribers["kept"].add(kept_websocket)
+
+    orchestrator.mark_task_dirty("deleted")
+    orchestrator.mark_task_dirty("kept")
+    await orchestrator.delete_task("deleted")
+    await orchestrator._flush_task
+
+    assert deleted_websocket.sent == []
+    assert deleted_websocket.closed
+    assert len(kept_websocket.sent) == 1
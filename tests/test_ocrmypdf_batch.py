@@ -0,0 +1,125 @@
+from io import BytesIO
+
+import ocrmypdf
+import pikepdf
+import pytest
+
+from docling.datamodel.base_models import DocumentStream
+
+from docling_serve.ocrmypdf_middleware import OCRMyPDFMiddleware
+from docling_serve.ocrmypdf_settings import OCRMyPDFSettings
+
+
+def make_pdf(name, widths):
+    """A PDF with one page per width, so pages can be told apart after a split."""
+    pdf = pikepdf.new()
+    for width in widths:
+        pdf.add_blank_page(page_size=(width, 72))
+    stream = BytesIO()
+    pdf.save(stream)
+    stream.seek(0)
+    return DocumentStream(name=name, stream=stream)
+
+
+def page_widths(stream):
+    with pikepdf.open(stream) as pdf:
+        return [float(page.mediabox[2]) for page in pdf.pages]
+
+
+@pytest.fixture
+def middleware():
+    return OCRMyPDFMiddleware(
+        settings=OCRMyPDFSettings(
+            enabled=True,
+            batch_max_file_size_mb=1,
+            cache_path=None,
+            parallel_processing=False,
+        )
+    )
+
+
+@pytest.fixture
+def ocr_runs(monkeypatch):
+    """Page widths of each OCRMyPDF input, the fake run copies input to output."""
+    runs = []
+
+    def fake_ocr(input_file, output_file, **kwargs):
+        input_file.seek(0)
+        runs.append(page_widths(input_file))
+        input_file.seek(0)
+        output_file.write(input_file.read())
+
+    monkeypatch.setattr(ocrmypdf, "ocr", fake_ocr)
+    return runs
+
+
+def test_small_files_share_one_run(middleware, ocr_runs):
+    sources = [
+        make_pdf("a.pdf", [100]),
+        make_pdf("b.pdf", [200, 300]),
+        make_pdf("c.pdf", [400]),
+    ]
+
+    processed = middleware.preprocess_document_streams(
+        sources, enable_preprocessing=True, ocr_mode="force"
+    )
+
+    assert ocr_runs == [[100, 200, 300, 400]]
+    assert [source.name for source in processed] == ["a.pdf", "b.pdf", "c.pdf"]
+    assert [page_widths(source.stream) for source in processed] == [
+        [100],
+        [200, 300],
+        [400],
+    ]
+
+
+def test_page_count_change_falls_back_to_each_file(middleware, monkeypatch):
+    runs = []
+
+    def dropping_ocr(input_file, output_file, **kwargs):
+        input_file.seek(0)
+        runs.append(page_widths(input_file))
+        input_file.seek(0)
+        with pikepdf.open(input_file) as pdf:
+            if len(pdf.pages) > 1:
+                del pdf.pages[-1]
+            pdf.save(output_file)
+
+    monkeypatch.setattr(ocrmypdf, "ocr", dropping_ocr)
+    sources = [make_pdf("a.pdf", [100]), make_pdf("b.pdf", [200])]
+
+    processed = middleware.preprocess_document_streams(
+        sources, enable_preprocessing=True, ocr_mode="force"
+    )
+
+    assert runs == [[100, 200], [100], [200]]
+    assert [page_widths(source.stream) for source in processed] == [[100], [200]]
+
+
+def test_unreadable_file_is_left_out_of_the_batch(middleware, ocr_runs):
+    broken = DocumentStream(name="broken.pdf", stream=BytesIO(b"not a pdf"))
+    sources = [make_pdf("a.pdf", [100]), broken, make_pdf("c.pdf", [300])]
+
+    processed = middleware.preprocess_document_streams(
+        sources, enable_preprocessing=True, ocr_mode="force"
+    )
+
+    # The two readable files share a run, the broken one fails on its own
+    assert ocr_runs == [[100, 300]]
+    assert page_widths(processed[0].stream) == [100]
+    assert processed[1].stream is broken.stream
+    assert page_widths(processed[2].stream) == [300]
+
+
+def test_only_force_mode_is_batched(middleware, ocr_runs):
+    sources = [make_pdf("a.pdf", [100]), make_pdf("b.pdf", [200])]
+
+    middleware.preprocess_document_streams(
+        sources, enable_preprocessing=True, ocr_modes=["redo", "redo"]
+    )
+
+    assert ocr_runs == [[100], [200]]
+
+
+def test_batching_is_off_by_default():
+    assert OCRMyPDFSettings.model_fields["batch_max_file_size_mb"].default == 0
@@ -0,0 +1,83 @@
+import os
+from io import BytesIO
+
+import ocrmypdf
+import pytest
+from pydantic import ValidationError
+
+from docling_serve.ocrmypdf_middleware import OCRMyPDFMiddleware
+from docling_serve.ocrmypdf_settings import OCRMyPDFSettings
+
+
+@pytest.fixture
+def ocr_calls(monkeypatch):
+    calls = []
+
+    def fake_ocr(**kwargs):
+        calls.append(kwargs)
+        kwargs["output_file"].write(b"ocr:" + kwargs["input_file"].getvalue())
+
+    monkeypatch.setattr(ocrmypdf, "ocr", fake_ocr)
+    return calls
+
+
+def make_middleware(cache_path, **settings):
+    return OCRMyPDFMiddleware(
+        settings=OCRMyPDFSettings(enabled=True, cache_path=cache_path, **settings)
+    )
+
+
+def test_cache_hit_and_miss(tmp_path, ocr_calls):
+    middleware = make_middleware(tmp_path)
+
+    first = middleware.preprocess_file(BytesIO(b"pdf-1"), "a.pdf", ocr_mode="force")
+    assert first.read() == b"ocr:pdf-1"
+    assert len(ocr_calls) == 1
+
+    # Same content under another name is served from the cache
+    second = middleware.preprocess_file(BytesIO(b"pdf-1"), "b.pdf", ocr_mode="force")
+    assert second.read() == b"ocr:pdf-1"
+    assert len(ocr_calls) == 1
+
+    middleware.preprocess_file(BytesIO(b"pdf-2"), "a.pdf", ocr_mode="force")
+    assert len(ocr_calls) == 2
+
+
+def test_cache_key_covers_arguments(tmp_path, ocr_calls):
+    middleware = make_middleware(tmp_path)
+
+    middleware.preprocess_file(BytesIO(b"pdf"), "a.pdf", ocr_mode="force")
+    middleware.preprocess_file(BytesIO(b"pdf"), "a.pdf", ocr_mode="force", deskew=False)
+    middleware.preprocess_file(
+        BytesIO(b"pdf"), "a.pdf", ocr_mode="force", ocr_languages=["ar"]
+    )
+    assert len(ocr_calls) == 3
+    assert len(list(tmp_path.glob("*.pdf"))) == 3
+
+
+def test_cache_evicts_least_recently_used(tmp_path, ocr_calls):
+    middleware = make_middleware(tmp_path, cache_max_entries=2)
+
+    for mtime, content in enumerate([b"pdf-1", b"pdf-2"]):
+        middleware.preprocess_file(BytesIO(content), "a.pdf", ocr_mode="force")
+        for path in tmp_path.glob("*.pdf"):
+            if path.read_bytes() == b"ocr:" + content:
+                os.utime(path, (mtime, mtime))
+
+    middleware.preprocess_file(BytesIO(b"pdf-3"), "a.pdf", ocr_mode="force")
+    cached = sorted(path.read_bytes() for path in tmp_path.glob("*.pdf"))
+    assert cached == [b"ocr:pdf-2", b"ocr:pdf-3"]
+
+
+def test_cache_max_entries_must_be_positive():
+    with pytest.raises(ValidationError):
+        OCRMyPDFSettings(cache_max_entries=0)
+
+
+def test_warmup_bypasses_cache(tmp_path, ocr_calls):
+    middleware = make_middleware(tmp_path)
+
+    middleware.warmup()
+    middleware.warmup()
+    assert len(ocr_calls) == 2
+    assert list(tmp_path.glob("*.pdf")) == []
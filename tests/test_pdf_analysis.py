@@ -0,0 +1,33 @@
+import sys
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+
+from docling_serve.pdf_analysis import analyze_pdf
+
+ROOT = Path(__file__).parents[1]
+
+# Cover every verdict: force (scans), redo (untagged text) and skip (tagged text)
+FIXTURES = [
+    ROOT / "tests" / "2206.01062v1.pdf",
+    ROOT / "tests" / "2408.09869v5.pdf",
+    ROOT / "test-files" / "arabic" / "Doc 13.pdf",
+    ROOT / "test-files" / "arabic" / "Doc 13 OCR.pdf",
+    ROOT / "test-files" / "arabic" / "Other.pdf",
+    ROOT / "test-files" / "english" / "HR.pdf",
+    ROOT / "test-files" / "english" / "SOP Returns.pdf",
+    ROOT / "test-files" / "greek" / "HR Greek.pdf",
+]
+
+
+@pytest.mark.parametrize("path", FIXTURES, ids=lambda path: path.name)
+def test_pdfium_verdict_matches_pdfplumber(path, monkeypatch):
+    """The pdfium text layer must lead to the same verdict as pdfplumber's."""
+    pdfium_result = analyze_pdf(BytesIO(path.read_bytes()))
+
+    # A None entry makes `import pypdfium2` fail, forcing the pdfplumber path
+    monkeypatch.setitem(sys.modules, "pypdfium2", None)
+    pdfplumber_result = analyze_pdf(BytesIO(path.read_bytes()))
+
+    assert pdfium_result == pdfplumber_result
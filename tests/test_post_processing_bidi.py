@@ -0,0 +1,11 @@
+from docling_serve.post_processing_bidi import process_markdown
+
+
+def test_rtl_brackets_are_mirrored():
+    assert process_markdown("مرحبا (عالم)\n") == "(ملاع) ابحرم\n"
+    assert process_markdown("السعر [100] دينار") == "رانيد [100] رعسلا"
+
+
+def test_ltr_markdown_is_unchanged():
+    text = "# Title\n\nSome (plain) text\n"
+    assert process_markdown(text) is text
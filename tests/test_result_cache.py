@@ -0,0 +1,125 @@
+import os
+from io import BytesIO
+
+import pytest
+from pydantic import ValidationError
+
+from docling.datamodel.base_models import ConversionStatus, DocumentStream
+
+from docling_serve import result_cache
+from docling_serve.datamodel.convert import ConvertDocumentsOptions
+from docling_serve.datamodel.responses import (
+    ConvertDocumentResponse,
+    DocumentResponse,
+)
+from docling_serve.settings import DoclingServeSettings, docling_serve_settings
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(docling_serve_settings, "result_cache_path", tmp_path)
+    result_cache.get_result_cache_dir.cache_clear()
+    yield tmp_path
+    result_cache.get_result_cache_dir.cache_clear()
+
+
+@pytest.fixture
+def fresh_fingerprint():
+    result_cache.server_fingerprint.cache_clear()
+    yield
+    result_cache.server_fingerprint.cache_clear()
+
+
+def make_sources(content=b"%PDF-1.4 content"):
+    return [DocumentStream(name="doc.pdf", stream=BytesIO(content))]
+
+
+def make_response(filename="doc.pdf"):
+    return ConvertDocumentResponse(
+        document=DocumentResponse(filename=filename, md_content="# Title"),
+        status=ConversionStatus.SUCCESS,
+        processing_time=1.0,
+    )
+
+
+def test_key_covers_content_and_options():
+    options = ConvertDocumentsOptions()
+    key = result_cache.result_cache_key(make_sources(), options)
+    assert key is not None
+    assert key == result_cache.result_cache_key(make_sources(), options)
+    assert key != result_cache.result_cache_key(make_sources(b"other"), options)
+    assert key != result_cache.result_cache_key(
+        make_sources(), ConvertDocumentsOptions(do_ocr=False)
+    )
+
+
+def test_key_skips_uncacheable_tasks():
+    assert (
+        result_cache.result_cache_key(
+            ["https://example.com/doc.pdf"], ConvertDocumentsOptions()
+        )
+        is None
+    )
+    assert (
+        result_cache.result_cache_key(
+            make_sources(), ConvertDocumentsOptions(enable_ai_vision=True)
+        )
+        is None
+    )
+
+
+def test_key_covers_server_settings(fresh_fingerprint, monkeypatch):
+    options = ConvertDocumentsOptions()
+    key = result_cache.result_cache_key(make_sources(), options)
+
+    monkeypatch.setattr(
+        docling_serve_settings,
+        "max_num_pages",
+        docling_serve_settings.max_num_pages - 1,
+    )
+    result_cache.server_fingerprint.cache_clear()
+    assert key != result_cache.result_cache_key(make_sources(), options)
+
+
+def test_store_and_load(cache_dir):
+    result_cache.store_cached_result("key", make_response())
+    cached = result_cache.load_cached_result("key")
+    assert cached is not None
+    assert cached.document.md_content == "# Title"
+    assert result_cache.load_cached_result("missing") is None
+
+
+def test_expired_entry_is_discarded(cache_dir):
+    result_cache.store_cached_result("key", make_response())
+    path = cache_dir / "key.json"
+    expired = path.stat().st_mtime - docling_serve_settings.result_cache_ttl - 1
+    os.utime(path, (expired, expired))
+
+    assert result_cache.load_cached_result("key") is None
+    assert not path.exists()
+
+
+def test_unreadable_entry_is_discarded(cache_dir):
+    path = cache_dir / "key.json"
+    path.write_text("not json")
+
+    assert result_cache.load_cached_result("key") is None
+    assert not path.exists()
+
+
+def test_oldest_entries_are_evicted(cache_dir, monkeypatch):
+    monkeypatch.setattr(docling_serve_settings, "result_cache_max_entries", 2)
+    for mtime, key in enumerate(["first", "second"]):
+        result_cache.store_cached_result(key, make_response())
+        os.utime(cache_dir / f"{key}.json", (mtime, mtime))
+
+    result_cache.store_cached_result("third", make_response())
+    assert sorted(path.stem for path in cache_dir.glob("*.json")) == [
+        "second",
+        "third",
+    ]
+
+
+def test_max_entries_must_be_positive():
+    with pytest.raises(ValidationError):
+        DoclingServeSettings(result_cache_max_entries=0)
@@ -0,0 +1,85 @@
+from io import BytesIO
+
+import pytest
+
+from docling.datamodel.base_models import DocumentStream
+
+from docling_serve.datamodel.convert import ConvertDocumentsOptions
+from docling_serve.engines.async_local import worker
+
+
+class StubOCRMyPDFMiddleware:
+    enabled = True
+
+    def __init__(self):
+        self.calls = []
+
+    def preprocess_document_streams(self, file_sources, **kwargs):
+        self.calls.append(kwargs)
+        return [
+            DocumentStream(name=source.name, stream=BytesIO(b"ocr"))
+            for source in file_sources
+        ]
+
+
+@pytest.fixture
+def converted(monkeypatch):
+    """What convert_documents was called with, the conversion itself is stubbed."""
+    seen = {}
+
+    def fake_convert_documents(sources, options, headers):
+        seen["sources"] = sources
+        seen["force_ocr"] = options.force_ocr
+        return iter(())
+
+    monkeypatch.setattr(worker, "convert_documents", fake_convert_documents)
+    monkeypatch.setattr(
+        worker, "process_results", lambda conversion_options, conv_results, work_dir: {}
+    )
+    return seen
+
+
+def run_conversion(options, recommended_mode, work_dir):
+    sources = [DocumentStream(name="doc.pdf", stream=BytesIO(b"pdf"))]
+    analyses = {0: {"recommended_mode": recommended_mode}}
+    _, final_options = worker._run_conversion(
+        "task", sources, None, options, analyses, work_dir
+    )
+    return final_options
+
+
+def test_analysis_enables_force_ocr(converted, monkeypatch, tmp_path):
+    monkeypatch.setattr(worker, "ocrmypdf_middleware", None)
+
+    options = run_conversion(
+        ConvertDocumentsOptions(force_ocr=False), "force", tmp_path
+    )
+
+    assert options.force_ocr is True
+    assert converted["force_ocr"] is True
+
+
+def test_analysis_keeps_force_ocr_off_for_good_text(converted, monkeypatch, tmp_path):
+    monkeypatch.setattr(worker, "ocrmypdf_middleware", None)
+
+    options = run_conversion(ConvertDocumentsOptions(force_ocr=False), "redo", tmp_path)
+
+    assert options.force_ocr is False
+    assert converted["force_ocr"] is False
+
+
+def test_ocrmypdf_turns_force_ocr_off(converted, monkeypatch, tmp_path):
+    middleware = StubOCRMyPDFMiddleware()
+    monkeypatch.setattr(worker, "ocrmypdf_middleware", middleware)
+
+    options = run_conversion(
+        ConvertDocumentsOptions(force_ocr=False, enable_ocrmypdf_preprocessing=True),
+        "force",
+        tmp_path,
+    )
+
+    # The analysis turned force_ocr on, OCRMyPDF already did the OCR
+    assert middleware.calls[0]["ocr_modes"] == ["force"]
+    assert options.force_ocr is False
+    assert converted["force_ocr"] is False
+    assert converted["sources"][0].stream.getvalue() == b"ocr"